@@ -1,6 +1,11 @@
 import os
+import time
+import logging
+
 from pyblish import api as pyblish
 
+log = logging.getLogger(__name__)
+
 PACKAGE_DIR = os.path.dirname(__file__)
 PLUGINS_DIR = os.path.join(PACKAGE_DIR, "plugins")
 PUBLISH_PATH = os.path.join(PLUGINS_DIR, "publish")
@@ -25,3 +30,102 @@ def format_staging_dir(root, time, name):
 
     dirname = os.path.join(root, "stage", name, time)
     return dirname
+
+
+def publish_progressively(interval=60, plugins=None, retries=10,
+                          timeout=None):
+    """Publish image sequences of the shell host as frames finish rendering
+
+    Frames are integrated into a single version as they land,
+    and the version is marked complete once the render has finished
+    and every frame has been integrated. Publishing continues until
+    every submitted render layer is complete, including those yet
+    to output a single frame, or until frames remain missing after
+    `retries` publishes once every render has finished.
+
+    Arguments:
+        interval (int, optional): Seconds between each publish,
+            default 60.
+        plugins (list, optional): Plug-ins to publish with,
+            defaults to results of discover()
+        retries (int, optional): Publishes made once every render
+            has finished, before giving up on missing frames, default 10.
+        timeout (int, optional): Seconds after which to give up
+            altogether, default no limit.
+
+    Returns:
+        context of final publish
+
+    """
+
+    from . import scheduler
+
+    attempts = 0
+    started = time.time()
+
+    while True:
+        context = pyblish.Context()
+        context.data["progressive"] = True
+
+        scheduler.publish(context, plugins)
+
+        errors = [result["error"] for result in context.data["results"]
+                  if result["error"]]
+        if errors:
+            raise RuntimeError("Progressive publish failed: %s" % errors[0])
+
+        layers = dict(
+            (layer, list()) for layer in context.data.get("renderlayers", [])
+        )
+
+        for instance in context:
+            families = instance.data.get("families", [])
+            if "mindbender.imagesequence" in families:
+                layers.setdefault(instance.data["renderlayer"], []).append(
+                    instance)
+
+        if not layers:
+            raise RuntimeError("No render layers found in %s" %
+                               context.data.get("workspaceDir"))
+
+        complete = [
+            layer for layer, sequences in layers.items()
+            if sequences and all(instance.data.get("complete")
+                                 for instance in sequences)
+        ]
+
+        if len(complete) == len(layers):
+            return context
+
+        # Frames may never land, e.g. when dropped by the renderer
+        rendered = all(
+            sequences and all(instance.data.get("renderComplete")
+                              for instance in sequences)
+            for sequences in layers.values()
+        )
+
+        if rendered:
+            attempts += 1
+
+            if attempts > retries:
+                missing = [
+                    "%s: %s" % (instance, ", ".join(
+                        str(frame) for frame in
+                        instance.data.get("missingFrames", [])))
+                    for sequences in layers.values()
+                    for instance in sequences
+                    if not instance.data.get("complete")
+                ]
+
+                raise RuntimeError("Frames missing once rendered:\n%s"
+                                   % "\n".join(missing))
+
+        if timeout is not None and time.time() - started > timeout:
+            raise RuntimeError(
+                "Timed out after %ds, layers incomplete: %s" % (
+                    timeout, ", ".join(sorted(set(layers) - set(complete)))))
+
+        log.info("%d of %d render layers complete, next publish in %ds.." % (
+            len(complete), len(layers), interval))
+
+        time.sleep(interval)
@@ -0,0 +1,995 @@
+"""Standalone helper functions, independent of any host"""
+
+import os
+import re
+import sys
+import json
+import mmap
+import array
+import zlib
+import struct
+import binascii
+import itertools
+import multiprocessing
+
+# OpenEXR lines per chunk, per compression method
+EXR_LINES_PER_CHUNK = {
+    0: 1,    # NONE
+    1: 1,    # RLE
+    2: 1,    # ZIPS
+    3: 16,   # ZIP
+    4: 32,   # PIZ
+    5: 16,   # PXR24
+    6: 32,   # B44
+    7: 32,   # B44A
+    8: 32,   # DWAA
+    9: 256,  # DWAB
+}
+
+EXR_REQUIRED_ATTRIBUTES = (
+    "channels",
+    "compression",
+    "dataWindow",
+    "displayWindow",
+    "lineOrder",
+    "pixelAspectRatio",
+    "screenWindowCenter",
+    "screenWindowWidth",
+)
+
+EXR_MAGIC = b"\x76\x2f\x31\x01"
+PNG_MAGIC = b"\x89PNG\r\n\x1a\n"
+JPEG_MAGIC = b"\xff\xd8"
+
+# Compact shader relationships
+RELATIONSHIPS_SCHEMA = "polly:shaders-1.0"
+RELATIONSHIPS_MAGIC = b"PSR1"
+_FACES = re.compile(r"^f\[(\d+)(?::(\d+))?\]$")
+
+# Native animation curves
+CURVES_SCHEMA = "polly:curves-1.0"
+CURVES_MAGIC = b"PAC1"
+CURVES_ARRAYS = (
+    # Name, typecode, one value per key
+    ("times", "d"),
+    ("values", "d"),
+    ("inAngles", "d"),
+    ("outAngles", "d"),
+    ("inWeights", "d"),
+    ("outWeights", "d"),
+    ("inTangentTypes", "B"),
+    ("outTangentTypes", "B"),
+)
+
+# Tangent types, stored by index
+TANGENT_TYPES = (
+    "spline",
+    "linear",
+    "fast",
+    "slow",
+    "flat",
+    "step",
+    "stepnext",
+    "fixed",
+    "clamped",
+    "plateau",
+    "auto",
+)
+
+# Below this many frames, a process pool costs more than it saves
+POOL_THRESHOLD = 64
+
+
+def check_image(path):
+    """Return reason for why image at `path` is broken, or None
+
+    Only headers and structure are inspected; pixel data is never
+    decoded. Formats other than EXR, PNG and JPEG are not checked.
+
+    Arguments:
+        path (str): Absolute path to image
+
+    """
+
+    try:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return "File is empty"
+
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                if buf[:4] == EXR_MAGIC:
+                    return _check_exr(buf)
+                elif buf[:8] == PNG_MAGIC:
+                    return _check_png(buf)
+                elif buf[:2] == JPEG_MAGIC:
+                    return _check_jpeg(buf)
+                else:
+                    return None
+            finally:
+                buf.close()
+
+    except (IOError, OSError, ValueError) as e:
+        return str(e)
+
+
+def check_images(paths, processes=None):
+    """Check many images at once, in parallel where worthwhile
+
+    Arguments:
+        paths (list): Absolute paths to images
+        processes (int, optional): Size of process pool,
+            defaults to the number of cores.
+
+    Returns:
+        list of (path, reason) tuples for each broken image
+
+    """
+
+    paths = list(paths)
+
+    if len(paths) < POOL_THRESHOLD:
+        results = [check_image(path) for path in paths]
+
+    else:
+        processes = processes or multiprocessing.cpu_count()
+        chunksize = max(1, len(paths) // (processes * 4))
+
+        pool = multiprocessing.Pool(processes)
+        try:
+            results = pool.map(check_image, paths, chunksize)
+        finally:
+            pool.close()
+            pool.join()
+
+    return [
+        (path, reason)
+        for path, reason in zip(paths, results)
+        if reason is not None
+    ]
+
+
+def _check_exr(buf):
+    size = len(buf)
+
+    if size < 8:
+        return "Truncated EXR version field"
+
+    version, = struct.unpack_from("<I", buf, 4)
+    tiled = version & 0x200
+    deep = version & 0x800
+    multipart = version & 0x1000
+
+    # Header is a sequence of (name, type, size, value),
+    # terminated by an empty name.
+    attributes = dict()
+    pos = 8
+    while True:
+        end = buf.find(b"\x00", pos)
+        if end < 0:
+            return "Truncated EXR header"
+
+        if end == pos:
+            pos += 1
+            break
+
+        name = buf[pos:end]
+        end = buf.find(b"\x00", end + 1)
+        if end < 0 or end + 5 > size:
+            return "Truncated EXR header"
+
+        length, = struct.unpack_from("<i", buf, end + 1)
+        pos = end + 5
+        if length < 0 or pos + length > size:
+            return "Malformed EXR attribute '%s'" % name.decode("ascii",
+                                                                "replace")
+
+        attributes[name.decode("ascii", "replace")] = (pos, length)
+        pos += length
+
+    missing = [attr for attr in EXR_REQUIRED_ATTRIBUTES
+               if attr not in attributes]
+    if missing:
+        return "Missing EXR attributes: %s" % ", ".join(missing)
+
+    # Offset tables of tiled, deep and multi-part images
+    # vary in layout; their header alone is considered.
+    if tiled or deep or multipart:
+        return None
+
+    offset, _ = attributes["compression"]
+    compression = ord(buf[offset:offset + 1])
+    if compression not in EXR_LINES_PER_CHUNK:
+        return "Unknown EXR compression: %d" % compression
+
+    offset, _ = attributes["dataWindow"]
+    _, ymin, _, ymax = struct.unpack_from("<4i", buf, offset)
+    lines = EXR_LINES_PER_CHUNK[compression]
+    count = (ymax - ymin + lines) // lines
+
+    if pos + count * 8 > size:
+        return "Truncated EXR offset table"
+
+    # Offsets are written as zeroes up-front, and filled in
+    # once the last chunk is written.
+    offsets = struct.unpack_from("<%dQ" % count, buf, pos)
+    if 0 in offsets:
+        return "Incomplete EXR, %d of %d chunks missing" % (
+            offsets.count(0), count)
+
+    last = max(offsets)
+    if last + 8 > size:
+        return "Truncated EXR, last chunk beyond end of file"
+
+    _, length = struct.unpack_from("<ii", buf, last)
+    if last + 8 + length > size:
+        return "Truncated EXR, last chunk incomplete"
+
+    return None
+
+
+def _check_png(buf, crc_pixels=False):
+    size = len(buf)
+    pos = 8
+    first = True
+
+    while pos + 8 <= size:
+        length, = struct.unpack_from(">I", buf, pos)
+        type_ = buf[pos + 4:pos + 8]
+        end = pos + 8 + length
+
+        if end + 4 > size:
+            return "Truncated PNG chunk %s" % type_.decode("ascii",
+                                                           "replace")
+
+        if first and type_ != b"IHDR":
+            return "PNG does not start with IHDR"
+        first = False
+
+        # Pixel chunks make up the bulk of the file
+        if type_ != b"IDAT" or crc_pixels:
+            crc, = struct.unpack_from(">I", buf, end)
+            if zlib.crc32(buf[pos + 4:end]) & 0xffffffff != crc:
+                return "Bad CRC in PNG chunk %s" % type_.decode("ascii",
+                                                                "replace")
+
+        pos = end + 4
+
+        if type_ == b"IEND":
+            return None
+
+    return "Truncated PNG, missing IEND"
+
+
+def _check_jpeg(buf):
+    if buf[-2:] != b"\xff\xd9":
+        return "Truncated JPEG, missing end-of-image marker"
+
+    return None
+
+
+def compact_relationships(relationships):
+    """Return compact equivalent of shader `relationships`
+
+    Each ID is stored once, and referred to by index. Faces are stored
+    as integer ranges of the form [index, first, last], where a whole
+    mesh is [index, -1, -1]. Components other than faces are kept as-is.
+
+    Arguments:
+        relationships (dict): Output of `serialise_shaders`
+
+    Example:
+        >>> compact_relationships({
+        ...     "blinn1SG": ["a1.f[0:9]", "a1.f[20]", "b2"],
+        ... }) == {
+        ...     "schema": RELATIONSHIPS_SCHEMA,
+        ...     "ids": ["a1", "b2"],
+        ...     "shaders": {"blinn1SG": [0, 0, 9, 0, 20, 20, 1, -1, -1]},
+        ...     "other": {},
+        ... }
+        True
+
+    """
+
+    ids = list()
+    indices = dict()
+    shaders = dict()
+    other = dict()
+
+    for shader in sorted(relationships):
+        ranges = list()
+
+        for member in relationships[shader]:
+            id_, _, component = member.partition(".")
+
+            if component:
+                match = _FACES.match(component)
+                if match is None:
+                    other.setdefault(shader, list()).append(member)
+                    continue
+
+                first, last = match.groups()
+                first = int(first)
+                last = first if last is None else int(last)
+            else:
+                first = last = -1
+
+            if id_ not in indices:
+                indices[id_] = len(ids)
+                ids.append(id_)
+
+            ranges.extend((indices[id_], first, last))
+
+        shaders[shader] = ranges
+
+    return {
+        "schema": RELATIONSHIPS_SCHEMA,
+        "ids": ids,
+        "shaders": shaders,
+        "other": other,
+    }
+
+
+def iter_relationships(relationships):
+    """Yield (shader, id, component) from either form of `relationships`
+
+    The component is an empty string for whole meshes.
+
+    Arguments:
+        relationships (dict): Output of `serialise_shaders`, or
+            `compact_relationships`
+
+    """
+
+    if relationships.get("schema") != RELATIONSHIPS_SCHEMA:
+        for shader, members in relationships.items():
+            for member in members:
+                id_, _, component = member.partition(".")
+                yield shader, id_, component
+        return
+
+    ids = relationships["ids"]
+    for shader, ranges in relationships["shaders"].items():
+        for index in range(0, len(ranges), 3):
+            id_, first, last = ranges[index:index + 3]
+
+            if first < 0:
+                component = ""
+            elif first == last:
+                component = "f[%d]" % first
+            else:
+                component = "f[%d:%d]" % (first, last)
+
+            yield shader, ids[id_], component
+
+    for shader, members in relationships["other"].items():
+        for member in members:
+            id_, _, component = member.partition(".")
+            yield shader, id_, component
+
+
+def write_relationships(path, relationships):
+    """Write compact `relationships` to `path`
+
+    The payload is packed with msgpack where available, and
+    JSON otherwise, and compressed either way.
+
+    """
+
+    try:
+        import msgpack
+    except ImportError:
+        codec = b"j"
+        payload = json.dumps(relationships,
+                             separators=(",", ":")).encode("utf-8")
+    else:
+        codec = b"m"
+        payload = msgpack.packb(relationships, use_bin_type=True)
+
+    with open(path, "wb") as f:
+        f.write(RELATIONSHIPS_MAGIC + codec + zlib.compress(payload))
+
+
+def read_relationships(path):
+    """Read relationships from `path`, as written by `write_relationships`
+
+    Plain JSON, as written by earlier versions of the lookdev
+    extractor, is supported too.
+
+    """
+
+    with open(path, "rb") as f:
+        data = f.read()
+
+    if not data.startswith(RELATIONSHIPS_MAGIC):
+        return json.loads(data.decode("utf-8"))
+
+    codec = data[4:5]
+    payload = zlib.decompress(data[5:])
+
+    if codec == b"m":
+        import msgpack
+
+        try:
+            return msgpack.unpackb(payload, raw=False)
+        except TypeError:
+            # msgpack < 0.5.2, without `raw`
+            return msgpack.unpackb(payload, encoding="utf-8")
+
+    return json.loads(payload.decode("utf-8"))
+
+
+def write_curves(path, curves):
+    """Write animation `curves` to `path`
+
+    Keys of every curve are stored one curve after another, in flat
+    arrays of `CURVES_ARRAYS`, with the number of keys of each curve
+    as "count" of each entry of "curves". A curve driving more than
+    one attribute lists each as [node, attribute] in "destinations".
+
+    Arrays are written as raw little-endian values, preceded by a
+    header of everything else in JSON, and compressed.
+
+    Arguments:
+        path (str): Absolute path to file
+        curves (dict): Members "curves", "unit" and each of `CURVES_ARRAYS`
+
+    """
+
+    arrays = list()
+    for name, typecode in CURVES_ARRAYS:
+        values = array.array(typecode, curves.get(name, ()))
+
+        if sys.byteorder == "big":
+            values.byteswap()
+
+        arrays.append(values)
+
+    header = dict(
+        (key, value) for key, value in curves.items()
+        if key not in dict(CURVES_ARRAYS)
+    )
+    header["schema"] = CURVES_SCHEMA
+    header["lengths"] = [len(values) for values in arrays]
+
+    payload = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    payload = b"\n".join([payload] + [_tobytes(values) for values in arrays])
+
+    with open(path, "wb") as f:
+        f.write(CURVES_MAGIC + zlib.compress(payload))
+
+
+def read_curves(path):
+    """Read animation curves from `path`, as written by `write_curves`
+
+    Example:
+        >>> import tempfile
+        >>> path = os.path.join(tempfile.mkdtemp(), "anim.animcurves")
+        >>> write_curves(path, {
+        ...     "unit": "film",
+        ...     "curves": [{"node": "ctrl", "attribute": "tx", "count": 2}],
+        ...     "times": [1.0, 10.0],
+        ...     "values": [0.0, 5.5],
+        ... })
+        >>> curves = read_curves(path)
+        >>> curves["curves"][0]["node"] == "ctrl"
+        True
+        >>> list(curves["values"])
+        [0.0, 5.5]
+        >>> list(curves["inTangentTypes"])
+        []
+
+    """
+
+    with open(path, "rb") as f:
+        data = f.read()
+
+    assert data.startswith(CURVES_MAGIC), "%s is not a curves file" % path
+
+    data = zlib.decompress(data[len(CURVES_MAGIC):])
+    header, data = data.split(b"\n", 1)
+    curves = json.loads(header.decode("utf-8"))
+
+    offset = 0
+    for (name, typecode), length in zip(CURVES_ARRAYS, curves["lengths"]):
+        values = array.array(typecode)
+        size = values.itemsize * length
+
+        _frombytes(values, data[offset:offset + size])
+
+        if sys.byteorder == "big":
+            values.byteswap()
+
+        curves[name] = values
+
+        # Arrays are separated by a newline
+        offset += size + 1
+
+    return curves
+
+
+def reduce_curves(curves, tolerance=0.0):
+    """Return `curves` without keys that lie on a line between others
+
+    Only keys between linear or stepped spans are considered, as only
+    these evaluate from their keys alone. A key between linear spans
+    is removed when every key between its neighbours remaining lies
+    within `tolerance` of a straight line between them, and a key
+    between stepped spans when it holds a value within `tolerance`
+    of the key before it, such that curves evaluate to within
+    `tolerance` of the original at every frame.
+
+    Arguments:
+        curves (dict): As written by `write_curves`
+        tolerance (float, optional): Largest difference in value
+            permitted, default 0.0
+
+    Returns:
+        tuple of reduced curves and ratio of keys before to after
+
+    Example:
+        >>> linear, step, auto = 1, 5, 10
+        >>> curves, ratio = reduce_curves({
+        ...     "curves": [{"node": "ctrl", "attribute": "tx", "count": 6}],
+        ...     "times": [1, 2, 3, 4, 5, 6],
+        ...     "values": [0, 0, 0, 1, 2, 3],
+        ...     "inTangentTypes": [linear] * 6,
+        ...     "outTangentTypes": [linear] * 6,
+        ... })
+        >>> list(curves["times"]), list(curves["values"]), ratio
+        ([1, 3, 6], [0, 0, 3], 2.0)
+
+        Stepped keys are removed where they hold the same value
+
+        >>> curves, ratio = reduce_curves({
+        ...     "curves": [{"node": "ctrl", "attribute": "v", "count": 5}],
+        ...     "times": [1, 2, 3, 4, 5],
+        ...     "values": [1, 1, 0, 0, 1],
+        ...     "inTangentTypes": [step] * 5,
+        ...     "outTangentTypes": [step] * 5,
+        ... })
+        >>> list(curves["times"]), list(curves["values"])
+        ([1, 3, 5], [1, 0, 1])
+
+        Splines ease in and out of their keys, and are left as-is
+
+        >>> curves, ratio = reduce_curves({
+        ...     "curves": [{"node": "ctrl", "attribute": "tx", "count": 6}],
+        ...     "times": [1, 2, 3, 4, 5, 6],
+        ...     "values": [0, 0, 0, 1, 2, 3],
+        ...     "inTangentTypes": [auto] * 3 + [linear] * 3,
+        ...     "outTangentTypes": [auto] * 2 + [linear] * 4,
+        ... })
+        >>> list(curves["times"]), ratio
+        ([1, 2, 3, 6], 1.5)
+
+    """
+
+    linear = TANGENT_TYPES.index("linear")
+    step = TANGENT_TYPES.index("step")
+
+    arrays = [name for name, _ in CURVES_ARRAYS if len(curves.get(name, ()))]
+    reduced = dict(curves, curves=list())
+    for name in arrays:
+        reduced[name] = list()
+
+    before = sum(curve["count"] for curve in curves["curves"])
+    first = 0
+
+    for curve in curves["curves"]:
+        keys = list(range(first, first + curve["count"]))
+        first += curve["count"]
+
+        # The kind of span from each key to the next
+        spans = [
+            "linear" if (curves["outTangentTypes"][a] == linear and
+                         curves["inTangentTypes"][b] == linear)
+            else "step" if curves["outTangentTypes"][a] == step
+            else None
+            for a, b in zip(keys, keys[1:])
+        ]
+
+        kept = set(keys[:1] + keys[-1:])
+        for kind, group in itertools.groupby(range(len(spans)),
+                                             spans.__getitem__):
+            group = list(group)
+            run = keys[group[0]:group[-1] + 2]
+
+            if kind is None:
+                kept.update(run)
+                continue
+
+            reduce = _collinear_keys if kind == "linear" else _held_keys
+            kept.update(run[index] for index in reduce(
+                [curves["times"][key] for key in run],
+                [curves["values"][key] for key in run],
+                tolerance))
+
+        kept = sorted(kept)
+
+        for name in arrays:
+            reduced[name].extend(curves[name][key] for key in kept)
+
+        reduced["curves"].append(dict(curve, count=len(kept)))
+
+    after = sum(curve["count"] for curve in reduced["curves"])
+    return reduced, float(before) / after if after else 1.0
+
+
+def _held_keys(times, values, tolerance):
+    """Return indices of stepped keys to keep
+
+    A key is removed when it holds a value within `tolerance`
+    of the last kept key, which then holds in its place.
+
+    """
+
+    kept = [0]
+
+    for index in range(1, len(values) - 1):
+        if abs(values[index] - values[kept[-1]]) > tolerance:
+            kept.append(index)
+
+    if len(values) > 1:
+        kept.append(len(values) - 1)
+
+    return kept
+
+
+def _collinear_keys(times, values, tolerance):
+    """Return indices of keys to keep, in a single pass
+
+    Each key narrows the range of slopes from the last kept key
+    within which every key in between remains within `tolerance`.
+    Once the next key falls outside of it, the previous key is kept.
+
+    """
+
+    if len(times) < 3:
+        return list(range(len(times)))
+
+    kept = [0]
+    low, high = float("-inf"), float("inf")
+
+    for index in range(1, len(times)):
+        anchor = kept[-1]
+        span = float(times[index] - times[anchor])
+        slope = (values[index] - values[anchor]) / span
+
+        if index > anchor + 1 and not low <= slope <= high:
+            kept.append(index - 1)
+            anchor = index - 1
+            low, high = float("-inf"), float("inf")
+            span = float(times[index] - times[anchor])
+
+        low = max(low, (values[index] - tolerance - values[anchor]) / span)
+        high = min(high, (values[index] + tolerance - values[anchor]) / span)
+
+    kept.append(len(times) - 1)
+    return kept
+
+
+def _tobytes(values):
+    try:
+        return values.tobytes()
+    except AttributeError:
+        # Python 2
+        return values.tostring()
+
+
+def _frombytes(values, data):
+    try:
+        values.frombytes(data)
+    except AttributeError:
+        # Python 2
+        values.fromstring(data)
+
+
+def diff_assignments(current, desired):
+    """Return what to add and remove to turn `current` into `desired`
+
+    Arguments:
+        current (dict): Shader to members, as currently assigned
+        desired (dict): Shader to members, as they should be assigned
+
+    Returns:
+        tuple of (added, removed) dictionaries of shader to members
+
+    Example:
+        >>> added, removed = diff_assignments(
+        ...     {"a": ["m1", "m2"], "b": ["m3"]},
+        ...     {"a": ["m1"], "c": ["m3"]},
+        ... )
+        >>> sorted(added.items())
+        [('c', ['m3'])]
+        >>> sorted(removed.items())
+        [('a', ['m2']), ('b', ['m3'])]
+
+    """
+
+    added = dict()
+    removed = dict()
+
+    for shader in set(current) | set(desired):
+        before = set(current.get(shader, ()))
+        after = set(desired.get(shader, ()))
+
+        if after - before:
+            added[shader] = sorted(after - before)
+
+        if before - after:
+            removed[shader] = sorted(before - after)
+
+    return added, removed
+
+
+def ranges(indices):
+    """Return `indices` as sorted (first, last) pairs of consecutive runs
+
+    Example:
+        >>> ranges([5, 1, 2, 3, 8, 9])
+        [(1, 3), (5, 5), (8, 9)]
+
+    """
+
+    runs = list()
+    for index in sorted(set(indices)):
+        if runs and runs[-1][1] == index - 1:
+            runs[-1] = (runs[-1][0], index)
+        else:
+            runs.append((index, index))
+
+    return runs
+
+
+def check_geometry(points, counts, vertices, tolerance=1e-10):
+    """Return problematic components of a polygon mesh
+
+    Evaluated with NumPy where available, and pure Python otherwise.
+
+    Checks:
+        nanVertices: Vertices positioned at NaN or infinity
+        zeroAreaFaces: Faces with an area of `tolerance` or less
+        laminaFaces: Faces made up of the same vertices as another face
+        nonManifoldEdges: Edges shared by more than two faces,
+            as (vertex, vertex) pairs
+
+    Arguments:
+        points (list): Flat x, y and z of each vertex, one after another
+        counts (list): Number of vertices of each face
+        vertices (list): Vertex indices of each face, one face after another
+        tolerance (float, optional): Largest area considered zero
+
+    Returns:
+        dictionary of (check: indices) pairs
+
+    Example:
+        >>> # Two triangles on top of each other, and one without area
+        >>> invalid = check_geometry(
+        ...     points=[0, 0, 0, 1, 0, 0, 0, 1, 0, 2, 0, 0],
+        ...     counts=[3, 3, 3],
+        ...     vertices=[0, 1, 2, 2, 1, 0, 0, 1, 3],
+        ... )
+        >>> invalid["laminaFaces"]
+        [0, 1]
+        >>> invalid["zeroAreaFaces"]
+        [2]
+        >>> invalid["nonManifoldEdges"]
+        [(0, 1)]
+
+    """
+
+    try:
+        import numpy
+    except ImportError:
+        return _check_geometry_python(points, counts, vertices, tolerance)
+
+    points = numpy.array(points, dtype=numpy.float64).reshape(-1, 3)
+    counts = numpy.array(counts, dtype=numpy.int64)
+    vertices = numpy.array(vertices, dtype=numpy.int64)
+
+    invalid = {
+        "nanVertices": list(),
+        "zeroAreaFaces": list(),
+        "laminaFaces": list(),
+        "nonManifoldEdges": list(),
+    }
+
+    invalid["nanVertices"] = numpy.flatnonzero(
+        ~numpy.isfinite(points).all(axis=1)).tolist()
+
+    if not len(counts):
+        return invalid
+
+    # The next vertex of each face-vertex, wrapping around each face
+    starts = numpy.cumsum(counts) - counts
+    following = numpy.arange(1, len(vertices) + 1)
+    following[starts + counts - 1] = starts
+    following = vertices[following]
+
+    # Vector area, half the sum of cross products along each face
+    with numpy.errstate(invalid="ignore"):
+        crossed = numpy.cross(points[vertices], points[following])
+        area = numpy.linalg.norm(
+            numpy.add.reduceat(crossed, starts, axis=0), axis=1) / 2
+
+        invalid["zeroAreaFaces"] = numpy.flatnonzero(
+            area <= tolerance).tolist()
+
+    # Edges, as pairs of vertices regardless of direction
+    edges = numpy.sort(numpy.stack([vertices, following], axis=1), axis=1)
+    edges, shared = numpy.unique(edges, axis=0, return_counts=True)
+    invalid["nonManifoldEdges"] = [
+        tuple(edge) for edge in edges[shared > 2].tolist()
+    ]
+
+    # Faces with equal vertex count and sums are
+    # candidates, and compared vertex by vertex.
+    keys = numpy.stack([
+        counts,
+        numpy.add.reduceat(vertices, starts),
+        numpy.add.reduceat(vertices ** 2, starts),
+    ], axis=1)
+
+    _, inverse, occurrences = numpy.unique(
+        keys, axis=0, return_inverse=True, return_counts=True)
+    candidates = numpy.flatnonzero(occurrences[inverse.ravel()] > 1)
+
+    invalid["laminaFaces"] = _lamina_faces(
+        (face, vertices[starts[face]:starts[face] + counts[face]].tolist())
+        for face in candidates.tolist()
+    )
+
+    return invalid
+
+
+def _check_geometry_python(points, counts, vertices, tolerance):
+    points = list(zip(*[iter(points)] * 3))
+
+    invalid = {
+        "nanVertices": list(),
+        "zeroAreaFaces": list(),
+        "laminaFaces": list(),
+        "nonManifoldEdges": list(),
+    }
+
+    finite = set()
+    for index, point in enumerate(points):
+        if all(abs(point[axis]) < float("inf") for axis in range(3)):
+            finite.add(index)
+        else:
+            invalid["nanVertices"].append(index)
+
+    faces = list()
+    shared = dict()
+    start = 0
+
+    for face, count in enumerate(counts):
+        face_vertices = list(vertices[start:start + count])
+        start += count
+        faces.append((face, face_vertices))
+
+        area = [0.0, 0.0, 0.0]
+        for index, vertex in enumerate(face_vertices):
+            following = face_vertices[(index + 1) % count]
+
+            edge = (min(vertex, following), max(vertex, following))
+            shared[edge] = shared.get(edge, 0) + 1
+
+            if vertex in finite and following in finite:
+                a, b = points[vertex], points[following]
+                area[0] += a[1] * b[2] - a[2] * b[1]
+                area[1] += a[2] * b[0] - a[0] * b[2]
+                area[2] += a[0] * b[1] - a[1] * b[0]
+
+        if all(vertex in finite for vertex in face_vertices):
+            if sum(value ** 2 for value in area) ** 0.5 / 2 <= tolerance:
+                invalid["zeroAreaFaces"].append(face)
+
+    invalid["nonManifoldEdges"] = sorted(
+        edge for edge, count in shared.items() if count > 2)
+    invalid["laminaFaces"] = _lamina_faces(faces)
+
+    return invalid
+
+
+def _lamina_faces(faces):
+    """Return faces of `faces` sharing all vertices with another face"""
+    by_vertices = dict()
+    for face, face_vertices in faces:
+        by_vertices.setdefault(tuple(sorted(face_vertices)), []).append(face)
+
+    return sorted(
+        face for duplicates in by_vertices.values()
+        if len(duplicates) > 1
+        for face in duplicates
+    )
+
+
+def allocate_ids(count, existing=(), registry=None, length=12):
+    """Return `count` unique IDs, none of which are already taken
+
+    IDs are random hexadecimal strings, checked against each other,
+    `existing` and, optionally, a project-wide `registry`.
+
+    Arguments:
+        count (int): Number of IDs to allocate
+        existing (set, optional): IDs already taken, e.g. in the scene
+        registry (IdRegistry, optional): IDs taken across a project,
+            the newly allocated IDs are added to it.
+        length (int, optional): Number of characters per ID, default 12
+
+    Example:
+        >>> ids = allocate_ids(1000, existing={"000000000000"})
+        >>> len(set(ids))
+        1000
+        >>> all(len(id_) == 12 for id_ in ids)
+        True
+
+    """
+
+    allocated = list()
+    taken = set()
+    nbytes = (length + 1) // 2
+
+    if registry is not None:
+        registry.refresh()
+
+    while len(allocated) < count:
+        needed = count - len(allocated)
+        data = binascii.hexlify(os.urandom(nbytes * needed)).decode("ascii")
+
+        for index in range(needed):
+            id_ = data[index * nbytes * 2:index * nbytes * 2 + length]
+
+            if id_ in taken or id_ in existing:
+                continue
+
+            if registry is not None and id_ in registry:
+                continue
+
+            taken.add(id_)
+            allocated.append(id_)
+
+    if registry is not None:
+        registry.update(allocated)
+
+    return allocated
+
+
+class IdRegistry(object):
+    """Project-wide record of allocated IDs
+
+    IDs are appended to a plain text file, one per line, such that
+    many artists may allocate IDs without overwriting each other.
+
+    Arguments:
+        path (str): Absolute path to registry file
+
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._ids = set()
+        self._offset = 0
+
+        self.refresh()
+
+    def __contains__(self, id_):
+        return id_ in self._ids
+
+    def update(self, ids):
+        with open(self.path, "a") as f:
+            f.write("".join(id_ + "\n" for id_ in ids))
+
+        self._ids.update(ids)
+
+    def refresh(self):
+        """Read IDs appended since last time"""
+        try:
+            with open(self.path) as f:
+                f.seek(self._offset)
+                self._ids.update(line.strip() for line in f)
+                self._offset = f.tell()
+        except IOError:
+            pass
@@ -1,12 +1,14 @@
 import os
-import uuid
+import sys
 
 from maya import cmds, OpenMaya
 
 from avalon import maya, api as avalon
 from pyblish import api as pyblish
 
-from . import menu
+import polly.lib
+
+from . import menu, lib
 
 PARENT_DIR = os.path.dirname(__file__)
 PACKAGE_DIR = os.path.dirname(PARENT_DIR)
@@ -16,6 +18,15 @@ PUBLISH_PATH = os.path.join(PLUGINS_DIR, "maya", "publish")
 LOAD_PATH = os.path.join(PLUGINS_DIR, "maya", "load")
 CREATE_PATH = os.path.join(PLUGINS_DIR, "maya", "create")
 
+self = sys.modules[__name__]
+self._callbacks = list()
+
+# Meshes created since the last save, and whether
+# every mesh in the scene is to be considered instead.
+self._new_meshes = list()
+self._full_scan = True
+self._tracking = True
+
 
 def install():
     pyblish.register_plugin_path(PUBLISH_PATH)
@@ -29,6 +40,19 @@ def install():
     avalon.on("save", on_save)
     avalon.before("save", before_save)
 
+    lib.install_id_index()
+    lib.install_collection_cache()
+
+    self._callbacks[:] = [
+        OpenMaya.MDGMessage.addNodeAddedCallback(_on_mesh_added, "mesh"),
+        OpenMaya.MSceneMessage.addCallback(
+            OpenMaya.MSceneMessage.kBeforeOpen, _on_before_open),
+        OpenMaya.MSceneMessage.addCallback(
+            OpenMaya.MSceneMessage.kAfterOpen, _on_scene_reset),
+        OpenMaya.MSceneMessage.addCallback(
+            OpenMaya.MSceneMessage.kAfterNew, _on_scene_reset),
+    ]
+
 
 def uninstall():
     pyblish.deregister_plugin_path(PUBLISH_PATH)
@@ -37,20 +61,31 @@ def uninstall():
 
     menu.uninstall()
 
+    for callback in self._callbacks:
+        OpenMaya.MMessage.removeCallback(callback)
 
-def _set_uuid(node):
-    """Add mbID to `node`
+    self._callbacks[:] = []
 
-    Unless one already exists.
+    lib.uninstall_id_index()
+    lib.uninstall_collection_cache()
 
-    """
 
-    attr = "{0}.mbID".format(node)
+def _on_mesh_added(node, _):
+    if self._tracking:
+        self._new_meshes.append(OpenMaya.MObjectHandle(node))
+
 
-    if not cmds.objExists(attr):
-        cmds.addAttr(node, longName="mbID", dataType="string")
-        _, uid = str(uuid.uuid4()).rsplit("-", 1)
-        cmds.setAttr(attr, uid, type="string")
+def _on_before_open(_):
+    # Every mesh of an opened scene is considered on first save,
+    # so there's no need to track each one as it's being read.
+    self._full_scan = True
+    self._tracking = False
+
+
+def _on_scene_reset(_):
+    self._new_meshes[:] = []
+    self._full_scan = True
+    self._tracking = True
 
 
 def on_init(_):
@@ -77,19 +112,43 @@ def on_save(_):
     Any transform of a mesh, without an exising ID,
     is given one automatically on file save.
 
+    Only meshes created since the last save are considered,
+    except on the first save of a new or opened scene.
+
     """
 
     avalon.logger.info("Running callback on save..")
 
-    nodes = (set(cmds.ls(type="mesh", long=True)) -
-             set(cmds.ls(long=True, readOnly=True)) -
-             set(cmds.ls(long=True, lockedNodes=True)))
+    if self._full_scan:
+        nodes = cmds.ls(type="mesh", long=True)
+
+    else:
+        nodes = list()
+        for handle in self._new_meshes:
+            if not handle.isValid():
+                continue
+
+            fn = OpenMaya.MFnDagNode(handle.object())
+            nodes.append(fn.fullPathName())
+
+    if nodes:
+        nodes = (set(nodes) -
+                 set(cmds.ls(nodes, long=True, readOnly=True)) -
+                 set(cmds.ls(nodes, long=True, lockedNodes=True)))
+
+    if nodes:
+        transforms = cmds.listRelatives(list(nodes),
+                                        parent=True,
+                                        fullPath=True) or list()
 
-    transforms = cmds.listRelatives(list(nodes), parent=True) or list()
+        # Add unique identifiers
+        registry = avalon.Session.get("AVALON_ID_REGISTRY")
+        lib.assign_ids(sorted(set(transforms)),
+                       registry=(polly.lib.IdRegistry(registry)
+                                 if registry else None))
 
-    # Add unique identifiers
-    for node in transforms:
-        _set_uuid(node)
+    self._new_meshes[:] = []
+    self._full_scan = False
 
 
 def before_save(return_code, _):
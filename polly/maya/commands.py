@@ -615,7 +615,7 @@ def auto_connect_assets(src, dst):
         mbid = cmds.getAttr(input_transform + ".mbID")
         input_shape = cmds.listRelatives(input_transform, shapes=True)[0]
 
-        for output_transform in lib.lsattr("mbID", value=mbid):
+        for output_transform in lib.ls_id(mbid):
 
             ref = cmds.referenceQuery(output_transform, referenceNode=True)
             if ref != src:
@@ -1,10 +1,46 @@
 """Standalone helper functions"""
 
+import os
 import re
+import sys
+import copy
+import collections
+import json
+import hashlib
+import functools
 import contextlib
 from maya import cmds
+from maya.api import OpenMaya as om
 
-import avalon.maya.lib
+import polly.lib
+
+self = sys.modules[__name__]
+
+# Maya scenes extracted per family, by extension. Instances
+# may override these with a "sceneFormats" attribute, e.g. "ma mb"
+SCENE_FORMATS = {
+    "mindbender.model": ["ma"],
+    "mindbender.rig": ["ma", "mb"],
+    "mindbender.lookdev": ["ma"],
+}
+
+SCENE_TYPES = {
+    "ma": "mayaAscii",
+    "mb": "mayaBinary",
+}
+
+# Session index of nodes by mbID, kept current by callbacks.
+# The index is built on first use, and rebuilt on opening a scene.
+self._ids = None            # {id: {hash: MObjectHandle}}
+self._indexed = dict()      # {hash: (id, callback)}
+self._pending = list()      # Handles of nodes to (re)index on next use
+self._index_callbacks = list()
+
+# Results of collection, kept across publishes until the
+# relevant part of the scene changes.
+self._collections = dict()  # {key: [(name, members, data)]}
+self._watched = dict()      # {key: [callback]}
+self._cache_callbacks = list()
 
 
 def maintained_selection(arg=None):
@@ -218,6 +254,31 @@ def shape_from_element(element):
         return node
 
 
+def scene_formats(family, override=None):
+    """Return extensions of Maya scenes to extract for `family`
+
+    Arguments:
+        family (str): Family of instance, e.g. "mindbender.rig"
+        override (str, optional): Space-separated extensions, e.g. "ma mb"
+
+    Example:
+        >>> scene_formats("mindbender.rig")
+        ['ma', 'mb']
+        >>> scene_formats("mindbender.rig", override="mb")
+        ['mb']
+
+    """
+
+    formats = override.split() if override else SCENE_FORMATS.get(
+        family, ["ma"])
+
+    unsupported = set(formats) - set(SCENE_TYPES)
+    assert not unsupported, "Unsupported scene format(s): %s" % (
+        ", ".join(sorted(unsupported)))
+
+    return list(formats)
+
+
 def serialise_shaders(nodes):
     """Generate a shader set dictionary
 
@@ -252,115 +313,1263 @@ def serialise_shaders(nodes):
         nodes,
         long=True,
         recursive=True,
-        showType=True,
         objectsOnly=True,
         type="transform"
     )
 
-    meshes_by_id = {}
-    for mesh in valid_nodes:
-        shapes = cmds.listRelatives(valid_nodes[0],
-                                    shapes=True,
-                                    fullPath=True) or list()
+    if not valid_nodes:
+        return dict()
 
-        if shapes:
-            shape = shapes[0]
-            if not cmds.nodeType(shape):
-                continue
+    shapes = cmds.listRelatives(valid_nodes,
+                                shapes=True,
+                                fullPath=True,
+                                type="mesh") or list()
+
+    ids = read_ids(set(shape.rsplit("|", 1)[0] for shape in shapes))
+    shapes = [shape for shape in shapes if shape.rsplit("|", 1)[0] in ids]
+
+    if not shapes:
+        return dict()
+
+    shaders = set(cmds.listConnections(shapes,
+                                       type="shadingEngine") or list())
+
+    # Objects in this group are those that haven't got
+    # any shaders. These are expected to be managed
+    # elsewhere, such as by the default model loader.
+    shaders.discard("initialShadingGroup")
+
+    members_by_shader = {
+        shader: cmds.sets(shader, query=True) or list()
+        for shader in shaders
+    }
+
+    # Resolve every shaded node, including those assigned by
+    # face, to the transform carrying its ID, in a single pass.
+    names = set(
+        member.partition(".")[0]
+        for members in members_by_shader.values()
+        for member in members
+    )
+
+    transforms = dag_transforms(names)
+    ids.update(read_ids(set(transforms.values()) - set(ids)))
+
+    shader_by_id = {}
+    for shader, members in members_by_shader.items():
+        assigned = set()
+
+        for member in members:
+
+            # Enable shader assignment to faces.
+            name, _, faces = member.partition(".")
 
             try:
-                id_ = cmds.getAttr(mesh + ".mbID")
+                id_ = ids[transforms[name]]
+            except KeyError:
+                continue
+
+            assigned.add(".".join([id_, faces]) if faces else id_)
+
+        shader_by_id[shader] = sorted(assigned)
+
+    return shader_by_id
+
+
+def read_ids(nodes):
+    """Return the mbID of each of `nodes`
+
+    Nodes without an ID are left out.
+
+    Arguments:
+        nodes (list): Names of nodes
+
+    Returns:
+        dictionary of (node: id) pairs
+
+    """
+
+    ids = dict()
+    for node in nodes:
+        selection = om.MSelectionList()
+
+        try:
+            selection.add(node)
+        except RuntimeError:
+            continue
+
+        fn = om.MFnDependencyNode(selection.getDependNode(0))
+        if fn.hasAttribute("mbID"):
+            ids[node] = fn.findPlug("mbID", False).asString()
+
+    return ids
+
 
-                if id_ not in meshes_by_id:
-                    meshes_by_id[id_] = list()
+def read_attributes(nodes):
+    """Return the user-defined attributes of each of `nodes`
 
-                meshes_by_id[id_].append(mesh)
+    Values are read through the API in a single pass, and match those
+    of `cmds.getAttr`. Attributes of a type without a direct equivalent
+    are read via `cmds.getAttr` instead, and those which cannot be read
+    at all, such as mesh and color attributes, are given a value of None.
 
-            except ValueError:
+    Arguments:
+        nodes (list): Names of nodes
+
+    Returns:
+        dictionary of (node: {attribute: value}) pairs
+
+    """
+
+    attributes = dict()
+    for node in nodes:
+        selection = om.MSelectionList()
+
+        try:
+            selection.add(node)
+        except RuntimeError:
+            continue
+
+        fn = om.MFnDependencyNode(selection.getDependNode(0))
+        data = dict()
+
+        for index in range(fn.attributeCount()):
+            attr = fn.attribute(index)
+            fn_attr = om.MFnAttribute(attr)
+
+            if not fn_attr.dynamic:
                 continue
 
-    meshes_by_shader = dict()
-    for id_, mesh in meshes_by_id.items():
-        shape = cmds.listRelatives(mesh,
-                                   shapes=True,
-                                   fullPath=True) or list()
+            try:
+                value = _plug_value(fn.findPlug(attr, False), fn_attr)
+            except _Unsupported:
+                try:
+                    value = cmds.getAttr(node + "." + fn_attr.name)
+                except Exception:
+                    value = None
+
+            data[fn_attr.name] = value
+
+        attributes[node] = data
+
+    return attributes
+
+
+class _Unsupported(Exception):
+    pass
+
+
+def _plug_value(plug, fn_attr):
+    """Return value of `plug` as `cmds.getAttr` would"""
+
+    if fn_attr.array or plug.isCompound or plug.isChild:
+        raise _Unsupported()
+
+    attr = plug.attribute()
+
+    if attr.hasFn(om.MFn.kTypedAttribute):
+        if om.MFnTypedAttribute(attr).attrType() != om.MFnData.kString:
+            raise _Unsupported()
+
+        data = plug.asMObject()
+        return None if data.isNull() else om.MFnStringData(data).string()
+
+    if attr.hasFn(om.MFn.kEnumAttribute):
+        return plug.asShort()
+
+    if attr.hasFn(om.MFn.kNumericAttribute):
+        type_ = om.MFnNumericAttribute(attr).numericType()
 
-        for shader in cmds.listConnections(shape,
-                                           type="shadingEngine") or list():
+        if type_ == om.MFnNumericData.kBoolean:
+            return plug.asBool()
 
-            # Objects in this group are those that haven't got
-            # any shaders. These are expected to be managed
-            # elsewhere, such as by the default model loader.
-            if shader == "initialShadingGroup":
+        if type_ in (om.MFnNumericData.kByte,
+                     om.MFnNumericData.kChar,
+                     om.MFnNumericData.kShort,
+                     om.MFnNumericData.kInt,
+                     om.MFnNumericData.kLong):
+            return plug.asInt()
+
+        if type_ == om.MFnNumericData.kFloat:
+            return plug.asFloat()
+
+        if type_ == om.MFnNumericData.kDouble:
+            return plug.asDouble()
+
+    raise _Unsupported()
+
+
+def dag_transforms(nodes):
+    """Return the absolute path of the transform of each of `nodes`
+
+    Shapes resolve to their parent transform, whereas
+    transforms resolve to themselves. Non-DAG nodes are left out.
+
+    Arguments:
+        nodes (list): Names of transforms and shapes
+
+    Returns:
+        dictionary of (node: transform) pairs
+
+    """
+
+    transforms = dict()
+    for node in nodes:
+        selection = om.MSelectionList()
+
+        try:
+            selection.add(node)
+            path = selection.getDagPath(0)
+        except (RuntimeError, TypeError):
+            continue
+
+        if path.node().hasFn(om.MFn.kShape):
+            path.pop()
+
+        transforms[node] = path.fullPathName()
+
+    return transforms
+
+
+def dag_snapshot(nodes):
+    """Return type, hierarchy and flags of `nodes` and their descendants
+
+    The snapshot is taken in a single pass through the API, such that
+    validators may query it rather than Maya.
+
+    Each DAG node is keyed by its absolute path, and other nodes by
+    name. Each entry has the following members.
+
+        type (str): Type of node, e.g. "transform"
+        dag (bool): Whether the node is a DAG node
+        member (bool): Whether the node is one of `nodes`,
+            rather than a descendant of one
+        parent (str): Absolute path of parent, None for assemblies
+            and non-DAG nodes
+        children (list): Absolute paths of children within the snapshot
+        shapes (list): Absolute paths of shapes amongst children
+        id (str): mbID of the node, None if it has none
+        locked (bool): Whether the node is locked
+        readOnly (bool): Whether the node is from a referenced file
+
+    Arguments:
+        nodes (list): Names of nodes
+
+    Returns:
+        dictionary of (node: entry) pairs
+
+    """
+
+    snapshot = dict()
+    shapes = set()
+
+    def add(obj, name, parent, member):
+        if name not in snapshot:
+            fn = om.MFnDependencyNode(obj)
+            snapshot[name] = {
+                "type": fn.typeName,
+                "dag": obj.hasFn(om.MFn.kDagNode),
+                "member": False,
+                "parent": parent,
+                "children": list(),
+                "shapes": list(),
+                "id": (fn.findPlug("mbID", False).asString()
+                       if fn.hasAttribute("mbID") else None),
+                "locked": fn.isLocked,
+                "readOnly": fn.isFromReferencedFile,
+            }
+
+            if obj.hasFn(om.MFn.kShape):
+                shapes.add(name)
+
+        snapshot[name]["member"] |= member
+
+    selection = om.MSelectionList()
+    for node in nodes:
+        try:
+            selection.add(node)
+        except RuntimeError:
+            continue
+
+    for index in range(selection.length()):
+        obj = selection.getDependNode(index)
+
+        if not obj.hasFn(om.MFn.kDagNode):
+            add(obj, om.MFnDependencyNode(obj).name(), None, True)
+            continue
+
+        path = selection.getDagPath(index)
+        iterator = om.MItDag()
+        iterator.reset(path)
+
+        member = True
+        while not iterator.isDone():
+            name = iterator.fullPathName()
+            add(iterator.currentItem(),
+                name,
+                name.rsplit("|", 1)[0] or None,
+                member)
+
+            member = False
+            iterator.next()
+
+    # Members may be nested within each other, so relationships
+    # are established once every node has been added.
+    for name, entry in snapshot.items():
+        parent = snapshot.get(entry["parent"])
+
+        if parent is None:
+            continue
+
+        parent["children"].append(name)
+
+        if name in shapes:
+            parent["shapes"].append(name)
+
+    return snapshot
+
+
+def read_anim_curves(nodes, namespace=None):
+    """Return keys of every animation curve driving `nodes`
+
+    Keys are read in bulk, a handful of queries for all curves.
+    Only curves driven by time are included, set driven keys
+    are left out.
+
+    Arguments:
+        nodes (list): Names of animated nodes, e.g. controls
+        namespace (str, optional): Stripped from node names, such
+            that curves may be applied to another namespace
+
+    Returns:
+        dictionary, see :func:`polly.lib.write_curves`
+
+    """
+
+    connections = cmds.listConnections(nodes,
+                                       type="animCurve",
+                                       connections=True,
+                                       plugs=True,
+                                       source=True,
+                                       destination=False,
+                                       skipConversionNodes=True) or []
+
+    # A curve may drive more than one attribute, but is read only once
+    entries = collections.OrderedDict()
+    for dst, src in zip(connections[::2], connections[1::2]):
+        curve = src.split(".", 1)[0]
+
+        if curve not in entries:
+            if cmds.nodeType(curve) not in ("animCurveTL",
+                                            "animCurveTA",
+                                            "animCurveTU",
+                                            "animCurveTT"):
                 continue
 
-            if shader not in meshes_by_shader:
-                meshes_by_shader[shader] = list()
+            entries[curve] = list()
 
-            shaded = cmds.sets(shader, query=True) or list()
-            meshes_by_shader[shader].extend(shaded)
+        node, attribute = dst.split(".", 1)
+        if namespace and node.startswith(namespace + ":"):
+            node = node[len(namespace) + 1:]
 
-    shader_by_id = {}
-    for shader, shaded in meshes_by_shader.items():
+        entries[curve].append([node, attribute])
 
-        if shader not in shader_by_id:
-            shader_by_id[shader] = list()
+    curves = {
+        "unit": cmds.currentUnit(query=True, time=True),
+        "curves": list(),
+    }
 
-        for mesh in shaded:
+    for name, _ in polly.lib.CURVES_ARRAYS:
+        curves[name] = list()
 
-            # Enable shader assignment to faces.
-            name = mesh.split(".f[")[0]
+    if not entries:
+        return curves
+
+    names = list(entries)
+    selection = om.MSelectionList()
+    for curve in names:
+        selection.add(curve)
+
+    for index, curve in enumerate(names):
+        fn = om.MFnAnimCurve(selection.getDependNode(index))
+        destinations = entries[curve]
+        node, attribute = destinations[0]
+
+        curves["curves"].append({
+            "node": node,
+            "attribute": attribute,
+            "destinations": destinations,
+            "type": fn.typeName,
+            "count": fn.numKeys,
+            "weighted": fn.isWeighted,
+            "preInfinity": fn.preInfinityType,
+            "postInfinity": fn.postInfinityType,
+        })
+
+    types = dict((name, index)
+                 for index, name in enumerate(polly.lib.TANGENT_TYPES))
 
-            transform = name
-            if cmds.objectType(transform) == "mesh":
-                transform = cmds.listRelatives(name, parent=True)[0]
+    # One query per array, covering every curve at once
+    for name, command, flag in (("times", cmds.keyframe, "timeChange"),
+                                ("values", cmds.keyframe, "valueChange"),
+                                ("inAngles", cmds.keyTangent, "inAngle"),
+                                ("outAngles", cmds.keyTangent, "outAngle"),
+                                ("inWeights", cmds.keyTangent, "inWeight"),
+                                ("outWeights", cmds.keyTangent, "outWeight")):
+        curves[name] = command(names, query=True, **{flag: True}) or []
 
+    for name, flag in (("inTangentTypes", "inTangentType"),
+                       ("outTangentTypes", "outTangentType")):
+        curves[name] = [
+            types.get(tangent, types["auto"]) for tangent in
+            cmds.keyTangent(names, query=True, **{flag: True}) or []
+        ]
+
+    return curves
+
+
+def apply_anim_curves(curves, namespace=None):
+    """Create animation curves and connect them to their nodes
+
+    Nodes and attributes which do not exist, or are locked or
+    already connected, are skipped.
+
+    Arguments:
+        curves (dict): Output of :func:`read_anim_curves`
+        namespace (str, optional): Namespace of nodes to animate
+
+    Returns:
+        list of created animation curves
+
+    """
+
+    if curves.get("unit") not in (None, cmds.currentUnit(query=True,
+                                                         time=True)):
+        cmds.warning("Curves were keyed in '%s', the scene is in '%s'" % (
+            curves["unit"], cmds.currentUnit(query=True, time=True)))
+
+    tangents = {
+        "spline": om.MFnAnimCurve.kTangentSmooth,
+        "linear": om.MFnAnimCurve.kTangentLinear,
+        "fast": om.MFnAnimCurve.kTangentFast,
+        "slow": om.MFnAnimCurve.kTangentSlow,
+        "flat": om.MFnAnimCurve.kTangentFlat,
+        "step": om.MFnAnimCurve.kTangentStep,
+        "stepnext": om.MFnAnimCurve.kTangentStepNext,
+        "fixed": om.MFnAnimCurve.kTangentFixed,
+        "clamped": om.MFnAnimCurve.kTangentClamped,
+        "plateau": om.MFnAnimCurve.kTangentPlateau,
+        "auto": om.MFnAnimCurve.kTangentAuto,
+    }
+    tangents = [tangents[name] for name in polly.lib.TANGENT_TYPES]
+
+    # Values are read in UI units, whereas the API expects internal units
+    to_internal = {
+        "animCurveTA": lambda value: om.MAngle(
+            value, om.MAngle.uiUnit()).asRadians(),
+        "animCurveTL": lambda value: om.MDistance(
+            value, om.MDistance.uiUnit()).asCentimeters(),
+    }
+
+    fixed = polly.lib.TANGENT_TYPES.index("fixed")
+    unit = om.MTime.uiUnit()
+
+    created = list()
+    first = 0
+
+    for curve in curves["curves"]:
+        keys = range(first, first + curve["count"])
+        first += curve["count"]
+
+        if not curve["count"]:
+            continue
+
+        targets = list()
+        for node, attribute in curve.get("destinations") or [
+                (curve["node"], curve["attribute"])]:
+            if namespace:
+                node = namespace + ":" + node
+
+            plug = node + "." + attribute
+
+            selection = om.MSelectionList()
             try:
-                id_ = cmds.getAttr(transform + ".mbID")
-                shader_by_id[shader].append(mesh.replace(name, id_))
-            except KeyError:
+                selection.add(plug)
+                target = selection.getPlug(0)
+            except RuntimeError:
+                cmds.warning("Skipping missing %s" % plug)
                 continue
 
-        # Remove duplicates
-        shader_by_id[shader] = list(set(shader_by_id[shader]))
+            if target.isLocked or target.isDestination:
+                cmds.warning("Skipping locked or connected %s" % plug)
+                continue
 
-    return shader_by_id
+            targets.append((plug, target))
+
+        if not targets:
+            continue
+
+        fn = om.MFnAnimCurve()
+        fn.create(targets[0][1])
+
+        # Shared by every remaining destination
+        for plug, _ in targets[1:]:
+            cmds.connectAttr(fn.name() + ".output", plug)
+
+        fn.setIsWeighted(curve["weighted"])
+        fn.setPreInfinityType(curve["preInfinity"])
+        fn.setPostInfinityType(curve["postInfinity"])
+
+        convert = to_internal.get(curve.get("type"), float)
+        inputs = [curves["inTangentTypes"][key] for key in keys]
+        outputs = [curves["outTangentTypes"][key] for key in keys]
+
+        # Keys are added at once, with the most common tangents,
+        # leaving only the remainder to be set one key at a time.
+        common_in, common_out = collections.Counter(
+            zip(inputs, outputs)).most_common(1)[0][0]
+
+        fn.addKeys(
+            om.MTimeArray([om.MTime(curves["times"][key], unit)
+                           for key in keys]),
+            om.MDoubleArray([convert(curves["values"][key])
+                             for key in keys]),
+            tangents[common_in],
+            tangents[common_out])
+
+        created.append(fn.name())
+
+        for index, key in enumerate(keys):
+            for is_in, types, common in ((True, inputs, common_in),
+                                         (False, outputs, common_out)):
+                tangent = types[index]
+
+                if tangent != common:
+                    if is_in:
+                        fn.setInTangentType(index, tangents[tangent])
+                    else:
+                        fn.setOutTangentType(index, tangents[tangent])
+
+                # Angles and weights only apply to fixed tangents,
+                # setting them would otherwise turn tangents into fixed.
+                if tangent != fixed:
+                    continue
+
+                prefix = "in" if is_in else "out"
+                fn.setAngle(index,
+                            om.MAngle(curves[prefix + "Angles"][key],
+                                      om.MAngle.kDegrees),
+                            is_in)
+
+                if curve["weighted"]:
+                    fn.setWeight(index,
+                                 curves[prefix + "Weights"][key],
+                                 is_in)
+
+    return created
+
+
+def install_id_index():
+    """Maintain an index of nodes by mbID for the remainder of the session
+
+    Once installed, looking up nodes by ID no longer involves
+    scanning the scene. See :func:`ls_id` and :func:`id_index`.
+
+    """
+
+    uninstall_id_index()
+
+    self._index_callbacks[:] = [
+        om.MDGMessage.addNodeAddedCallback(_on_node_added, "transform"),
+        om.MDGMessage.addNodeRemovedCallback(_on_node_removed, "transform"),
+
+        # Nodes read from file are indexed all at once on next use
+        om.MSceneMessage.addCallback(om.MSceneMessage.kBeforeOpen,
+                                     _on_scene_reset),
+        om.MSceneMessage.addCallback(om.MSceneMessage.kAfterNew,
+                                     _on_scene_reset),
+    ]
+
+
+def uninstall_id_index():
+    for callback in self._index_callbacks:
+        _remove_callback(callback)
+
+    self._index_callbacks[:] = []
+    _reset_id_index()
+
+
+def update_id_index(nodes):
+    """Re-read the ID of `nodes` on next lookup
+
+    Use this after adding an ID to nodes other than through
+    :func:`assign_ids`, as only nodes already carrying an ID
+    are tracked for changes to it.
+
+    """
+
+    if self._ids is None:
+        return
+
+    for node in nodes:
+        selection = om.MSelectionList()
+
+        try:
+            selection.add(node)
+        except RuntimeError:
+            continue
+
+        self._pending.append(om.MObjectHandle(selection.getDependNode(0)))
+
+
+def assign_ids(nodes, registry=None):
+    """Add a unique mbID to each of `nodes`
+
+    Unless one already exists. IDs are allocated in one batch and
+    checked against those in the scene and, optionally, `registry`.
+
+    Arguments:
+        nodes (list): Absolute paths to nodes
+        registry (polly.lib.IdRegistry, optional): Project-wide
+            record of IDs to check against and add to.
+
+    Returns:
+        list of nodes given a new ID
+
+    """
+
+    existing = set(cmds.ls(["%s.mbID" % node for node in nodes],
+                           objectsOnly=True,
+                           long=True))
+    nodes = [node for node in nodes if node not in existing]
+
+    if not nodes:
+        return nodes
+
+    taken = _session_ids() if self._index_callbacks else id_index()
+    ids = polly.lib.allocate_ids(len(nodes),
+                                 existing=taken,
+                                 registry=registry)
+
+    cmds.addAttr(nodes, longName="mbID", dataType="string")
+
+    for node, id_ in zip(nodes, ids):
+        cmds.setAttr(node + ".mbID", id_, type="string")
+
+    update_id_index(nodes)
+
+    return nodes
+
+
+def ls_id(id_):
+    """Return absolute path of every node carrying mbID `id_`
 
+    Example:
+        >>> _ = cmds.file(new=True, force=True)
+        >>> node = cmds.createNode("transform", name="node")
+        >>> cmds.addAttr(node, longName="mbID", dataType="string")
+        >>> cmds.setAttr(node + ".mbID", "abc", type="string")
+        >>> "|node" in ls_id("abc")
+        True
+
+    """
+
+    if not self._index_callbacks:
+        return id_index().get(id_, [])
+
+    return [
+        _node_name(handle)
+        for handle in _session_ids().get(id_, {}).values()
+    ]
+
+
+def id_index(namespaces=None):
+    """Return every node carrying an mbID, grouped by ID
+
+    The session index is used when installed, otherwise
+    the scene is queried.
+
+    Arguments:
+        namespaces (list, optional): Only consider nodes within
+            these namespaces, defaults to the entire scene.
+
+    Returns:
+        dictionary of (id: [nodes]) pairs
+
+    """
+
+    if self._index_callbacks:
+        prefixes = tuple(
+            namespace.strip(":") + ":" for namespace in namespaces or [])
+
+        index = dict()
+        for id_, handles in _session_ids().items():
+            for handle in handles.values():
+                node = _node_name(handle)
+                if prefixes and not node.rsplit("|", 1)[-1].startswith(
+                        prefixes):
+                    continue
+
+                index.setdefault(id_, list()).append(node)
+
+        return index
+
+    if namespaces is None:
+        patterns = ["*.mbID"]
+    else:
+        patterns = ["%s:*.mbID" % namespace for namespace in namespaces]
+
+    nodes = cmds.ls(patterns,
+                    long=True,
+                    recursive=True,
+                    objectsOnly=True) or list()
+
+    index = dict()
+    for node, id_ in read_ids(nodes).items():
+        index.setdefault(id_, list()).append(node)
+
+    return index
+
+
+def _session_ids():
+    """Return the session index, bringing it up to date"""
+
+    if self._ids is None:
+        self._ids = dict()
+        self._pending[:] = []
+
+        selection = om.MSelectionList()
+        for node in cmds.ls("*.mbID",
+                            long=True,
+                            recursive=True,
+                            objectsOnly=True) or list():
+            selection.add(node)
+
+        for index in range(selection.length()):
+            _index_node(om.MObjectHandle(selection.getDependNode(index)))
+
+    while self._pending:
+        _index_node(self._pending.pop())
+
+    return self._ids
+
+
+def _index_node(handle):
+    _unindex_node(handle)
+
+    if not handle.isValid():
+        return
+
+    fn = om.MFnDependencyNode(handle.object())
+    if not fn.hasAttribute("mbID"):
+        return
+
+    # Only nodes carrying an ID are watched for it changing,
+    # rather than every node in the scene.
+    id_ = fn.findPlug("mbID", False).asString()
+    callback = om.MNodeMessage.addAttributeChangedCallback(
+        handle.object(), _on_attribute_changed, handle)
+
+    self._indexed[handle.hashCode()] = (id_, callback)
+
+    if id_:
+        self._ids.setdefault(id_, dict())[handle.hashCode()] = handle
+
+
+def _unindex_node(handle):
+    id_, callback = self._indexed.pop(handle.hashCode(), (None, None))
+
+    if callback is not None:
+        _remove_callback(callback)
+
+    if self._ids is not None:
+        self._ids.get(id_, {}).pop(handle.hashCode(), None)
+
+
+def _reset_id_index():
+    for _, callback in self._indexed.values():
+        _remove_callback(callback)
+
+    self._ids = None
+    self._indexed.clear()
+    self._pending[:] = []
+
+
+def _remove_callback(callback):
+    try:
+        om.MMessage.removeCallback(callback)
+    except RuntimeError:
+        # Already removed along with its node
+        pass
+
+
+def _node_name(handle):
+    obj = handle.object()
+
+    if obj.hasFn(om.MFn.kDagNode):
+        return om.MFnDagNode(obj).fullPathName()
+
+    return om.MFnDependencyNode(obj).name()
 
-def apply_shaders(relationships, namespace=None):
+
+def _on_node_added(node, _):
+    if self._ids is not None:
+        self._pending.append(om.MObjectHandle(node))
+
+
+def _on_node_removed(node, _):
+    if self._ids is not None:
+        _unindex_node(om.MObjectHandle(node))
+
+
+def _on_attribute_changed(message, plug, _, handle):
+    if not message & (om.MNodeMessage.kAttributeSet |
+                      om.MNodeMessage.kAttributeAdded |
+                      om.MNodeMessage.kAttributeRemoved):
+        return
+
+    if om.MFnAttribute(plug.attribute()).name == "mbID":
+        self._pending.append(handle)
+
+
+def _on_scene_reset(_):
+    _reset_id_index()
+
+
+def current_assignments(shaders, nodes=None):
+    """Return the members of each of `shaders`, by absolute path
+
+    Arguments:
+        shaders (list): Names of shading groups
+        nodes (set, optional): Only include members of these
+            transforms, by absolute path, defaults to all members.
+
+    Returns:
+        dictionary of (shader: [members]) pairs, where members are
+            absolute paths to transforms, optionally with faces.
+
+    """
+
+    members_by_shader = {
+        shader: cmds.sets(shader, query=True) or list()
+        for shader in shaders
+    }
+
+    transforms = dag_transforms(set(
+        member.partition(".")[0]
+        for members in members_by_shader.values()
+        for member in members
+    ))
+
+    assignments = dict()
+    for shader, members in members_by_shader.items():
+        assignments[shader] = list()
+
+        for member in members:
+            name, _, faces = member.partition(".")
+            transform = transforms.get(name)
+
+            if transform is None:
+                continue
+
+            if nodes is not None and transform not in nodes:
+                continue
+
+            assignments[shader].append(
+                ".".join([transform, faces]) if faces else transform)
+
+    return assignments
+
+
+def apply_shaders(relationships,
+                  namespace=None,
+                  target_namespace=None,
+                  incremental=False):
     """Given a dictionary of `relationships`, apply shaders to meshes
 
     Arguments:
         relationships (avalon-core:shaders-1.0): A dictionary of
-            shaders and how they relate to meshes.
+            shaders and how they relate to meshes, in either
+            plain or compact form.
+        namespace (str, optional): Namespace of shaders
+        target_namespace (str, optional): Only assign to meshes
+            within this namespace, defaults to the entire scene.
+        incremental (bool, optional): Only apply the difference
+            between current and given assignments. Members no longer
+            assigned revert to the default shader. Default False.
 
     """
 
-    if namespace is not None:
-        # Append namespace to shader group identifier.
-        # E.g. `blinn1SG` -> `Bruce_:blinn1SG`
-        relationships = {
-            "%s:%s" % (namespace, shader): relationships[shader]
-            for shader in relationships
-        }
+    return apply_shaders_to_namespaces(
+        relationships,
+        namespaces=(None if target_namespace is None
+                    else [target_namespace]),
+        namespace=namespace,
+        incremental=incremental,
+    )
+
+
+def apply_shaders_to_namespaces(relationships,
+                                namespaces=None,
+                                namespace=None,
+                                incremental=False):
+    """Apply shaders to meshes across many namespaces in one pass
+
+    IDs of all `namespaces` are looked up in a single index, and each
+    shader is assigned to all of its members, in every namespace, at
+    once. Use this to assign one look to many copies of an asset.
+
+    Arguments:
+        relationships (avalon-core:shaders-1.0): A dictionary of
+            shaders and how they relate to meshes, in either
+            plain or compact form.
+        namespaces (list, optional): Namespaces of meshes,
+            defaults to the entire scene.
+        namespace (str, optional): Namespace of shaders
+        incremental (bool, optional): Only apply the difference
+            between current and given assignments. Members no longer
+            assigned revert to the default shader. Default False.
+
+    """
 
-    for shader, ids in relationships.items():
+    index = id_index(namespaces)
+
+    members = dict()
+    for shader, id_, faces in polly.lib.iter_relationships(relationships):
+        if namespace is not None:
+            # Append namespace to shader group identifier.
+            # E.g. `blinn1SG` -> `Bruce_:blinn1SG`
+            shader = "%s:%s" % (namespace, shader)
+
+        # Convert IDs to mesh + id, e.g. "nameOfNode.f[1:100]"
+        members.setdefault(shader, list()).extend(
+            ".".join([mesh, faces]) if faces else mesh
+            for mesh in index.get(id_, [])
+        )
+
+    for shader in members:
         print("Looking for '%s'.." % shader)
-        shader = next(iter(cmds.ls(shader)), None)
-        assert shader, "Associated shader not part of asset, this is a bug"
+        assert cmds.objExists(shader), (
+            "Associated shader not part of asset, this is a bug")
+
+    if incremental:
+        shaders = set(members)
+        if namespace is not None:
+            shaders.update(cmds.ls(namespace + ":*", type="shadingEngine"))
+
+        current = current_assignments(
+            shaders,
+            nodes=set(node for nodes in index.values() for node in nodes)
+        )
+
+        members, removed = polly.lib.diff_assignments(current, members)
+
+        # Members assigned elsewhere are moved by their addition
+        moved = set(member for added in members.values()
+                    for member in added)
+        reverted = sorted(set(
+            member for shader in removed
+            for member in removed[shader]) - moved
+        )
+
+        if reverted:
+            print("Reverting %d members to default shader" % len(reverted))
+            cmds.sets(reverted, forceElement="initialShadingGroup")
+
+    for shader, meshes in members.items():
+        if not meshes:
+            continue
+
+        print("Assigning '%s' to %d members" % (shader, len(meshes)))
+        cmds.sets(meshes, forceElement=shader)
+
+
+def install_collection_cache():
+    """Keep results of collection across publishes of an unchanged scene
 
-        for id_ in ids:
-            mesh, faces = (id_.rsplit(".", 1) + [""])[:2]
+    Results are stored per collector with :func:`cache_collection`, and
+    discarded once any node they were collected from changes, nodes of
+    the watched types are created or deleted, or any node is renamed or
+    reparented.
 
-            # Find all meshes matching this particular ID
-            # Convert IDs to mesh + id, e.g. "nameOfNode.f[1:100]"
-            meshes = list(
-                ".".join([mesh, faces])
-                for mesh in avalon.maya.lib.lsattr("mbID", value=mesh)
+    """
+
+    uninstall_collection_cache()
+
+    self._cache_callbacks[:] = [
+        # Sets hold both instances and global render settings
+        om.MDGMessage.addNodeAddedCallback(_on_collected_node_changed,
+                                           "objectSet", None),
+        om.MDGMessage.addNodeRemovedCallback(_on_collected_node_changed,
+                                             "objectSet", None),
+        om.MDGMessage.addNodeAddedCallback(_on_collected_node_changed,
+                                           "renderLayer", "renderlayers"),
+        om.MDGMessage.addNodeRemovedCallback(_on_collected_node_changed,
+                                             "renderLayer", "renderlayers"),
+
+        # Members are stored by name
+        om.MNodeMessage.addNameChangedCallback(om.MObject.kNullObj,
+                                               _on_renamed),
+        om.MDagMessage.addAllDagChangesCallback(_on_dag_changed),
+
+        om.MSceneMessage.addCallback(om.MSceneMessage.kBeforeOpen,
+                                     _on_collection_reset),
+        om.MSceneMessage.addCallback(om.MSceneMessage.kAfterNew,
+                                     _on_collection_reset),
+    ]
+
+
+def uninstall_collection_cache():
+    for callback in self._cache_callbacks:
+        _remove_callback(callback)
+
+    self._cache_callbacks[:] = []
+    invalidate_collection()
+
+
+def cached_collection(key):
+    """Return copy of what was cached under `key`, or None
+
+    Arguments:
+        key (str): Name of collection, e.g. "instances"
+
+    Returns:
+        list of (name, members, data) tuples
+
+    """
+
+    if key not in self._collections:
+        return None
+
+    return copy.deepcopy(self._collections[key])
+
+
+def cache_collection(key, collection, watch):
+    """Store `collection` under `key` until any of `watch` changes
+
+    Nothing is stored unless the cache is installed.
+
+    Arguments:
+        key (str): Name of collection, e.g. "instances"
+        collection (list): Tuples of (name, members, data)
+        watch (list): Names of nodes the collection was derived from
+
+    """
+
+    if not self._cache_callbacks:
+        return
+
+    invalidate_collection(key)
+
+    callbacks = list()
+    for node in set(watch):
+        selection = om.MSelectionList()
+
+        try:
+            selection.add(node)
+        except RuntimeError:
+            continue
+
+        callbacks.append(om.MNodeMessage.addAttributeChangedCallback(
+            selection.getDependNode(0), _on_watched_changed, key))
+
+    self._collections[key] = copy.deepcopy(collection)
+    self._watched[key] = callbacks
+
+
+def invalidate_collection(key=None):
+    """Discard what was cached under `key`, or everything when None"""
+
+    for key in ([key] if key is not None else list(self._collections)):
+        self._collections.pop(key, None)
+
+        for callback in self._watched.pop(key, []):
+            _remove_callback(callback)
+
+
+def _on_watched_changed(message, plug, _, key):
+    if message & (om.MNodeMessage.kAttributeSet |
+                  om.MNodeMessage.kAttributeAdded |
+                  om.MNodeMessage.kAttributeRemoved |
+                  om.MNodeMessage.kConnectionMade |
+                  om.MNodeMessage.kConnectionBroken):
+        invalidate_collection(key)
+
+
+def _on_collected_node_changed(node, key):
+    invalidate_collection(key)
+
+
+def _on_renamed(node, previous, _):
+    if self._collections:
+        invalidate_collection()
+
+
+def _on_dag_changed(message, child, parent, _):
+    if self._collections:
+        invalidate_collection()
+
+
+def _on_collection_reset(_):
+    invalidate_collection()
+
+
+def fingerprint(nodes, aspects, snapshot=None):
+    """Return a hash of those `aspects` of `nodes` validation depends on
+
+    The names of `nodes` and their descendants are always included.
+
+    Aspects:
+        hierarchy: Type and parent of each node
+        ids: mbID of each node
+        topology: Vertices of each face of each mesh
+        points: Position of each vertex of each mesh
+        normals: Normals of each mesh
+        history: Name and type of each node upstream of `nodes`
+
+    Hashing topology, points or normals visits every element of each
+    mesh, and so costs as much as a validator visiting each one once.
+
+    Arguments:
+        nodes (list): Names of nodes
+        aspects (list): Names of aspects, from the above
+        snapshot (dict, optional): :func:`dag_snapshot` of `nodes`,
+            if already taken
+
+    Returns:
+        hexadecimal digest (str)
+
+    """
+
+    snapshot = snapshot or dag_snapshot(nodes)
+    digest = hashlib.md5()
+
+    def update(*values):
+        digest.update(
+            "|".join(str(value) for value in values).encode("utf-8"))
+
+    for node in sorted(snapshot):
+        update(node)
+
+    aspects = sorted(set(aspects))
+    unknown = set(aspects) - set(("hierarchy", "ids", "topology",
+                                  "points", "normals", "history"))
+    assert not unknown, "Unknown aspect(s): %s" % ", ".join(unknown)
+
+    meshes = sorted(node for node, entry in snapshot.items()
+                    if entry["type"] == "mesh")
+
+    for aspect in aspects:
+        update("#", aspect)
+
+        if aspect == "hierarchy":
+            for node in sorted(snapshot):
+                update(node, snapshot[node]["type"], snapshot[node]["parent"])
+
+        elif aspect == "ids":
+            for node in sorted(snapshot):
+                update(node, snapshot[node]["id"])
+
+        elif aspect == "history":
+            history = cmds.listHistory(list(snapshot)) if snapshot else None
+            for node in sorted(cmds.ls(history or [], showType=True) or []):
+                update(node)
+
+        else:
+            selection = om.MSelectionList()
+            for mesh in meshes:
+                selection.add(mesh)
+
+            for index, mesh in enumerate(meshes):
+                fn = om.MFnMesh(selection.getDagPath(index))
+
+                if aspect == "topology":
+                    counts, vertices = fn.getVertices()
+                    update(mesh, counts, vertices)
+
+                elif aspect == "points":
+                    update(mesh, fn.getPoints())
+
+                elif aspect == "normals":
+                    update(mesh, fn.getNormals())
+
+    return digest.hexdigest()
+
+
+def skip_unchanged(*aspects):
+    """Skip validation of instances unchanged since they last passed
+
+    Each time the decorated validator passes, a :func:`fingerprint` of
+    `aspects` of the instance is stored next to the current scene, as
+    <scene>.validation.json. On subsequent publishes, the validator
+    is skipped for as long as the fingerprint remains the same.
+
+    Unsaved scenes are always validated.
+
+    Only validators costing more than a fingerprint of what they read
+    gain from this, such as those checking every face of each mesh.
+    Those reading only the :func:`dag_snapshot` cost less than hashing
+    it, and those following history cost as much as hashing it.
+
+    Example:
+        >>> class Validate(pyblish.api.InstancePlugin):  # doctest: +SKIP
+        ...     @skip_unchanged("topology", "normals")
+        ...     def process(self, instance):
+        ...         pass
+
+    Arguments:
+        aspects (str): Aspects the validator depends on,
+            see :func:`fingerprint`
+
+    """
+
+    def decorator(process):
+
+        # Pyblish determines what to pass a plug-in by the
+        # names of its arguments, so these must remain as-is.
+        @functools.wraps(process)
+        def wrapper(self, instance):
+            path = instance.context.data.get("currentFile")
+
+            if not path or not os.path.isfile(path):
+                return process(self, instance)
+
+            path += ".validation.json"
+            plugin = type(self).__name__
+            key = "%s:%s" % (
+                getattr(self, "version", None),
+                fingerprint(list(instance), aspects,
+                            instance.data.get("dagSnapshot"))
             )
 
-            if not meshes:
-                continue
+            if _read_validation(path).get(
+                    str(instance), {}).get(plugin) == key:
+                self.log.info("\"%s\" is unchanged since last "
+                              "validated, skipping" % instance)
+                return
+
+            result = process(self, instance)
+
+            validation = _read_validation(path)
+            validation.setdefault(str(instance), {})[plugin] = key
+
+            try:
+                with open(path, "w") as f:
+                    json.dump(validation, f, indent=4, sort_keys=True)
+            except IOError:
+                # Caching is an optimisation, validation itself passed
+                self.log.warning("Could not write \"%s\"" % path)
+
+            return result
+
+        return wrapper
 
-            print("Assigning '%s' to '%s'" % (shader, ", ".join(meshes)))
-            cmds.sets(meshes, forceElement=shader)
+    return decorator
+
+
+def _read_validation(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (IOError, ValueError):
+        return dict()
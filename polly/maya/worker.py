@@ -0,0 +1,266 @@
+"""Extract in headless mayapy processes, alongside the current session
+
+The current scene is saved to a temporary snapshot once per publish,
+after which each export is handed to a pool of mayapy processes that
+each open the snapshot and perform a single export. The snapshot
+is removed once every export has finished successfully, whereas
+the output of a failed export is kept for inspection.
+
+Usage:
+    >>> job = submit(context, "export_selected",  # doctest: +SKIP
+    ...              nodes=["|ROOT"], path="/stage/model.ma")
+    >>> job.wait()  # doctest: +SKIP
+
+Exports run alongside the remainder of extraction, such as that of
+looks and curves, which happens in the current session. Integration
+requires every export to have finished, so the publish, and with it
+the session, waits on them before integrating; the artist regains
+control once the publish has finished, as usual.
+
+Background extraction is enabled by AVALON_BACKGROUND_EXTRACTION,
+with AVALON_WORKERS processes at most. The mayapy executable is
+assumed to reside next to the running Maya, or at AVALON_MAYAPY.
+
+"""
+
+import os
+import sys
+import json
+import errno
+import shutil
+import tempfile
+import subprocess
+import multiprocessing
+from multiprocessing.pool import ThreadPool
+
+from maya import cmds
+
+self = sys.modules[__name__]
+self._pool = None
+
+# Run by each worker, as `mayapy -c`
+BOOTSTRAP = """\
+import sys
+from maya import standalone
+standalone.initialize()
+from polly.maya import worker
+sys.exit(worker.main(sys.argv[1]))
+"""
+
+
+def enabled():
+    """Return whether to extract in the background"""
+    from avalon import api
+    return bool(api.Session.get("AVALON_BACKGROUND_EXTRACTION",
+                                os.getenv("AVALON_BACKGROUND_EXTRACTION")))
+
+
+def mayapy():
+    """Return path to the mayapy executable"""
+    executable = "mayapy.exe" if sys.platform == "win32" else "mayapy"
+    return os.getenv("AVALON_MAYAPY") or os.path.join(
+        os.path.dirname(sys.executable), executable)
+
+
+def pool():
+    if self._pool is None:
+        processes = int(os.getenv("AVALON_WORKERS") or
+                        max(1, multiprocessing.cpu_count() // 2))
+        self._pool = ThreadPool(processes)
+
+    return self._pool
+
+
+def snapshot(context):
+    """Save the current scene for workers to open, once per publish
+
+    References are preserved, along with any unsaved edits made to them.
+
+    """
+
+    if "workerScene" not in context.data:
+        dirname = os.path.join(context.data["workspaceDir"],
+                               "stage",
+                               "snapshot",
+                               context.data["time"])
+
+        try:
+            os.makedirs(dirname)
+        except OSError:
+            pass
+
+        path = os.path.join(dirname, "scene.ma")
+        cmds.file(path,
+                  force=True,
+                  exportAll=True,
+                  typ="mayaAscii",
+                  preserveReferences=True)
+
+        context.data["workerScene"] = path
+
+    return context.data["workerScene"]
+
+
+class Job(object):
+    """An export being performed by a worker"""
+
+    def __init__(self, scene, function, kwargs):
+        self.function = function
+
+        fd, self.path = tempfile.mkstemp(suffix=".json", prefix="job-")
+        with os.fdopen(fd, "w") as f:
+            json.dump({
+                "scene": scene,
+                "function": function,
+                "kwargs": kwargs,
+            }, f)
+
+        self.log = self.path[:-len(".json")] + ".log"
+        self._result = pool().apply_async(self._run)
+
+    def _run(self):
+        with open(self.log, "w") as log:
+            return subprocess.call([mayapy(), "-c", BOOTSTRAP, self.path],
+                                   stdout=log,
+                                   stderr=subprocess.STDOUT)
+
+    def succeeded(self):
+        """Return whether the job has finished successfully"""
+        return (self._result.ready() and
+                self._result.successful() and
+                self._result.get() == 0)
+
+    def wait(self):
+        """Block until finished, raising an error on failure
+
+        The log of a failed job is kept, and referenced in the error.
+
+        """
+
+        try:
+            returncode = self._result.get()
+        finally:
+            _remove(self.path)
+
+        if returncode != 0:
+            with open(self.log) as f:
+                output = f.read()
+
+            raise RuntimeError("%s failed with code %d, see %s:\n%s" % (
+                self.function, returncode, self.log, output[-2000:]))
+
+        _remove(self.log)
+
+
+def _remove(path):
+    """Remove file at `path`, if it still exists"""
+    try:
+        os.remove(path)
+    except OSError as e:
+        if e.errno != errno.ENOENT:
+            raise
+
+
+def submit(context, function, **kwargs):
+    """Perform `function` of this module in a worker
+
+    Arguments:
+        context (pyblish.api.Context): Current publish
+        function (str): Name of export function, e.g. "export_selected"
+        kwargs (dict): Arguments passed to `function`, must be
+            serialisable to JSON
+
+    Returns:
+        Job
+
+    """
+
+    assert function in ("export_selected",
+                        "export_alembics"), (
+        "Unsupported function: %s" % function)
+
+    job = Job(snapshot(context), function, kwargs)
+    context.data.setdefault("workerJobs", []).append(job)
+
+    return job
+
+
+def cleanup(context):
+    """Remove the snapshot of `context`, once every job has succeeded
+
+    The snapshot is kept whilst a job is running, or if one has failed.
+
+    """
+
+    if "workerScene" not in context.data:
+        return
+
+    if not all(job.succeeded() for job in context.data["workerJobs"]):
+        return
+
+    shutil.rmtree(os.path.dirname(context.data.pop("workerScene")),
+                  ignore_errors=True)
+
+
+def main(path):
+    """Perform the job at `path`, from within a worker"""
+    with open(path) as f:
+        job = json.load(f)
+
+    cmds.file(job["scene"], open=True, force=True)
+    globals()[job["function"]](**job["kwargs"])
+
+    return 0
+
+
+def export_selected(nodes, path, typ="mayaAscii", **options):
+    """Export `nodes` to `path` as Maya scene of `typ`, see `cmds.file`"""
+    from avalon import maya
+
+    with maya.maintained_selection(), maya.without_extension():
+        cmds.select(nodes, noExpand=True)
+        cmds.file(path,
+                  force=True,
+                  typ=typ,
+                  exportSelected=True,
+                  **options)
+
+
+def export_alembics(jobs):
+    """Export each of `jobs` to Alembic, evaluating the scene once
+
+    Each job is a dictionary of `nodes`, `path`, `frame_range` and
+    optionally `attribute_prefix`, `write_uv` and `write_visibility`,
+    written to its own file.
+
+    """
+
+    from maya import mel
+    from avalon import maya
+
+    cmds.loadPlugin("AbcExport.mll", quiet=True)
+
+    arguments = list()
+    for job in jobs:
+        options = [
+            ("file", job["path"]),
+            ("frameRange", "%s %s" % tuple(job["frame_range"])),
+        ] + [("root", node) for node in job["nodes"]]
+
+        if job.get("attribute_prefix"):
+            options.append(("attrPrefix", str(job["attribute_prefix"])))
+
+        if job.get("write_uv"):
+            options.append(("uvWrite", ""))
+
+        if job.get("write_visibility"):
+            options.append(("writeVisibility", ""))
+
+        arguments.append("-j \"%s\"" % " ".join(
+            "-{0} {1}".format(key, value) for key, value in options))
+
+    if not arguments:
+        return
+
+    with maya.suspended_refresh():
+        mel.eval("AbcExport %s" % " ".join(arguments))
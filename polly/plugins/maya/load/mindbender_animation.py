@@ -33,13 +33,11 @@ class CurvesLoader(avalon.maya.Loader):
     """Specific loader of Curves for the mindbender.animation family"""
 
     families = ["mindbender.animation"]
-    representations = ["curves"]
+    representations = ["animcurves", "curves"]
 
     def process(self, name, namespace, context, data):
         from maya import cmds
-        from avalon import maya, api
-
-        cmds.loadPlugin("atomImportExport.mll", quiet=True)
+        from avalon import maya, api, io
 
         # Load the rig using the RigLoader
         loader = {Loader.__name__: Loader for Loader in
@@ -47,9 +45,16 @@ class CurvesLoader(avalon.maya.Loader):
         if loader is None:
             raise RuntimeError("Unable to find RigLoader")
 
-        rig = context["representation"]["dependencies"][0]
+        # Reference the binary scene of the rig, when published
+        rig = io.find_one({
+            "_id": io.ObjectId(context["representation"]["dependencies"][0])
+        })
+        rig = io.find_one({"type": "representation",
+                           "parent": rig["parent"],
+                           "name": "mb"}) or rig
+
         container = maya.load(loader,
-                              rig,
+                              rig["_id"],
                               name=name,
                               namespace=namespace,
 
@@ -64,6 +69,34 @@ class CurvesLoader(avalon.maya.Loader):
         except StopIteration:
             raise TypeError("%s is missing controls_SET")
 
+        if self.fname.endswith(".animcurves"):
+            nodes = self._load_curves(control_set)
+        else:
+            nodes = self._load_atom(control_set, namespace)
+
+        self[:] = nodes + cmds.sets(container, query=True) + [container]
+
+        # Trigger post process only if it's not been set to disabled
+        if data.get("post_process", True):
+            self._post_process(name, namespace, context, data)
+
+    def _load_curves(self, control_set):
+        import os
+        import polly.lib
+        from polly.maya import lib
+
+        # Curves are stored without namespace
+        namespace = control_set.rpartition(":")[0]
+        curves = polly.lib.read_curves(os.path.expandvars(self.fname))
+
+        return lib.apply_anim_curves(curves, namespace=namespace)
+
+    def _load_atom(self, control_set, namespace):
+        """Backwards compatibility, for curves published via atomExport"""
+        from maya import cmds
+
+        cmds.loadPlugin("atomImportExport.mll", quiet=True)
+
         cmds.select(control_set)
         options = ";".join([
             "",
@@ -98,11 +131,7 @@ class CurvesLoader(avalon.maya.Loader):
             returnNewNodes=True,
         )
 
-        self[:] = nodes + cmds.sets(container, query=True) + [container]
-
-        # Trigger post process only if it's not been set to disabled
-        if data.get("post_process", True):
-            self._post_process(name, namespace, context, data)
+        return nodes
 
     def _post_process(self, name, namespace, context, data):
         import os
@@ -5,14 +5,14 @@ class LookLoader(avalon.maya.Loader):
     """Specific loader for lookdev"""
 
     families = ["mindbender.lookdev"]
-    representations = ["ma"]
+    representations = ["mb", "ma"]
 
     def process(self, name, namespace, context, data):
         import os
-        import json
 
         from maya import cmds
         from polly.maya import lib
+        import polly.lib
 
         try:
             existing_reference = cmds.file(self.fname,
@@ -34,21 +34,24 @@ class LookLoader(avalon.maya.Loader):
             nodes = cmds.referenceQuery(existing_reference, nodes=True)
             namespace = nodes[0].split(":", 1)[0]
 
-        # Assign shaders
-        self.fname = self.fname.rsplit(".", 1)[0] + ".json"
-
+        # Assign shaders, preferring the compact representation
         # Expand $AVALON_PROJECT and friends, if used
-        self.fname = os.path.expandvars(self.fname)
-
-        if not os.path.isfile(self.fname):
+        basename = os.path.expandvars(self.fname.rsplit(".", 1)[0])
+        self.fname = next((
+            fname for fname in (basename + ".shaders",
+                                basename + ".json")
+            if os.path.isfile(fname)), None
+        )
+
+        if self.fname is None:
             self.log.warning("Look development asset "
                              "has no relationship data.\n"
-                             "%s was not found" % self.fname)
+                             "%s.json was not found" % basename)
             return nodes
 
-        with open(self.fname) as f:
-            relationships = json.load(f)
-
-        lib.apply_shaders(relationships, namespace)
+        # Only what differs from current assignments is applied,
+        # such that reusing an existing lookdev is cheap.
+        relationships = polly.lib.read_relationships(self.fname)
+        lib.apply_shaders(relationships, namespace, incremental=True)
 
         self[:] = nodes
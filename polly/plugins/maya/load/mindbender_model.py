@@ -9,7 +9,7 @@ class ModelLoader(avalon.maya.Loader):
     """
 
     families = ["mindbender.model"]
-    representations = ["ma"]
+    representations = ["mb", "ma"]
 
     def process(self, name, namespace, context, data):
         from maya import cmds
@@ -9,7 +9,7 @@ class RigLoader(avalon.maya.Loader):
     """
 
     families = ["mindbender.rig"]
-    representations = ["ma"]
+    representations = ["mb", "ma"]
 
     def process(self, name, namespace, context, data):
         from maya import cmds
@@ -0,0 +1,28 @@
+import pyblish.api
+
+
+class CollectMindbenderDagSnapshot(pyblish.api.InstancePlugin):
+    """Capture the hierarchy of each instance for validators to query
+
+    The type, parent, shapes, mbID and locked and read-only state
+    of every member and their descendants are read once, and stored
+    as `dagSnapshot`. See :func:`polly.maya.lib.dag_snapshot`.
+
+    """
+
+    label = "DAG Snapshot"
+    order = pyblish.api.CollectorOrder + 0.2
+    hosts = ["maya"]
+    families = [
+        "mindbender.model",
+        "mindbender.rig",
+        "mindbender.lookdev",
+    ]
+
+    def process(self, instance):
+        from polly.maya import lib
+
+        instance.data["dagSnapshot"] = lib.dag_snapshot(instance)
+
+        self.log.info("Captured %d nodes of \"%s\"" % (
+            len(instance.data["dagSnapshot"]), instance))
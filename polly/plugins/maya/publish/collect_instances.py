@@ -21,24 +21,56 @@ class CollectMindbenderInstances(pyblish.api.ContextPlugin):
     hosts = ["maya"]
 
     def process(self, context):
+        from polly.maya import lib
+
+        # Unchanged since last publish
+        collection = lib.cached_collection("instances")
+
+        if collection is None:
+            collection, objsets = self.collect()
+
+            # Empty sets are watched too, in case members are added
+            lib.cache_collection("instances", collection, watch=objsets)
+
+        for name, members, data in collection:
+
+            # Sets aren't DAG nodes, their full name is also their short name
+            instance = context.create_instance(data.get("name", name))
+            instance[:] = members
+            instance.data.update(data)
+
+            # Produce diagnostic message for any graphical
+            # user interface interested in visualising it.
+            self.log.info("Found: \"%s\" " % instance.data["name"])
+
+    def collect(self):
+        """Return (objset, members, data) per instance, and sets considered"""
         from maya import cmds
+        from polly.maya import lib
 
-        for objset in cmds.ls("*.id",
-                              long=True,            # Produce full names
-                              type="objectSet",     # Only consider objectSets
-                              recursive=True,       # Include namespace
-                              objectsOnly=True):    # Return objectSet, rather
-                                                    # than its members
+        objsets = cmds.ls("*.id",
+                          long=True,            # Produce full names
+                          type="objectSet",     # Only consider objectSets
+                          recursive=True,       # Include namespace
+                          objectsOnly=True)     # Return objectSet, rather
+                                                # than its members
 
-            is_empty = cmds.sets(objset, query=True) is None
+        # Read every attribute of every set in one go
+        attributes = lib.read_attributes(objsets)
+
+        collection = list()
+        for objset in objsets:
+            members = cmds.sets(objset, query=True)
+
+            is_empty = members is None
             if is_empty:
                 self.log.info("%s skipped, it was empty." % objset)
                 continue
 
-            if not cmds.objExists(objset + ".id"):
-                continue
+            # Apply each user defined attribute as data
+            data = attributes.get(objset, {})
 
-            if cmds.getAttr(objset + ".id") not in (
+            if data.get("id") not in (
                     "pyblish.avalon.instance",
 
                     # Backwards compatibility
@@ -48,29 +80,9 @@ class CollectMindbenderInstances(pyblish.api.ContextPlugin):
 
             # The developer is responsible for specifying
             # the family of each instance.
-            assert cmds.objExists(objset + ".family"), (
+            assert "family" in data, (
                 "\"%s\" was missing a family" % objset)
 
-            data = dict()
+            collection.append((objset, members, data))
 
-            # Apply each user defined attribute as data
-            for attr in cmds.listAttr(objset, userDefined=True) or list():
-                try:
-                    value = cmds.getAttr(objset + "." + attr)
-                except Exception:
-                    # Some attributes cannot be read directly,
-                    # such as mesh and color attributes. These
-                    # are considered non-essential to this
-                    # particular publishing pipeline.
-                    value = None
-
-                data[attr] = value
-
-            name = cmds.ls(objset, long=False)[0]  # Use short name
-            instance = context.create_instance(data.get("name", name))
-            instance[:] = cmds.sets(objset, query=True) or list()
-            instance.data.update(data)
-
-            # Produce diagnostic message for any graphical
-            # user interface interested in visualising it.
-            self.log.info("Found: \"%s\" " % instance.data["name"])
+        return collection, objsets
@@ -9,16 +9,90 @@ class CollectMindbenderMayaRenderlayers(pyblish.api.ContextPlugin):
     label = "Render Layers"
 
     def process(self, context):
+        from avalon import api
+        from polly.maya import lib
+
+        # Unchanged since last publish
+        collection = lib.cached_collection("renderlayers")
+
+        if collection is None:
+            collection, watch = self.collect()
+            lib.cache_collection("renderlayers", collection, watch=watch)
+
+        for layer, _, data in collection:
+            data.update({
+                "time": context.data["time"],
+                "author": context.data["user"],
+                "source": context.data["currentFile"].replace(
+                    api.registered_root(), "{root}"
+                ).replace("\\", "/"),
+            })
+
+            instance = context.create_instance(layer)
+            instance.data.update(data)
+
+    def collect(self):
+        """Return (layer, members, data) per layer, and nodes read from"""
         from maya import cmds
-        from avalon import maya, api
+        from avalon import maya
 
-        def render_global(attr):
-            return cmds.getAttr("defaultRenderGlobals." + attr)
+        watch = ["defaultRenderGlobals"]
+
+        # Include (optional) global settings
+        try:
+            avalon_globals = maya.lsattr("id", "avalon.renderglobals")[0]
+        except IndexError:
+            avalon_globals = None
+            avalon_settings = None
+        else:
+            watch.append(avalon_globals)
+            avalon_settings = maya.read(avalon_globals)
+
+        # Render settings are read once, as seen from the active
+        # layer, and overridden per layer where necessary.
+        live = {
+            "defaultRenderGlobals." + attr:
+                cmds.getAttr("defaultRenderGlobals." + attr)
+            for attr in ("startFrame",
+                         "endFrame",
+                         "byFrameStep",
+                         "currentRenderer")
+        }
+
+        if avalon_settings is not None:
+            live.update({
+                avalon_globals + "." + attr: avalon_settings[attr]
+                for attr in ("pool", "group", "frames", "priority")
+            })
+
+        # Whilst another layer is active, values it overrides
+        # are held by the adjustments of the default layer.
+        active = cmds.editRenderLayerGlobals(query=True,
+                                             currentRenderLayer=True)
+
+        base = dict(live)
+        if active != "defaultRenderLayer":
+            base.update(self.overrides("defaultRenderLayer"))
+
+        collection = list()
 
         for layer in cmds.ls(type="renderLayer"):
+            watch.append(layer)
+
             if layer.endswith("defaultRenderLayer"):
                 continue
 
+            # Adjustments of the active layer may lag behind its
+            # current values, which are read directly instead.
+            if layer == active:
+                values = live
+            else:
+                values = dict(base)
+                values.update(self.overrides(layer))
+
+            def render_global(attr):
+                return values["defaultRenderGlobals." + attr]
+
             data = {
                 "family": "Render Layers",
                 "families": ["mindbender.renderlayer"],
@@ -27,12 +101,6 @@ class CollectMindbenderMayaRenderlayers(pyblish.api.ContextPlugin):
                 "endFrame": render_global("endFrame"),
                 "byFrameStep": render_global("byFrameStep"),
                 "renderer": render_global("currentRenderer"),
-
-                "time": context.data["time"],
-                "author": context.data["user"],
-                "source": context.data["currentFile"].replace(
-                    api.registered_root(), "{root}"
-                ).replace("\\", "/"),
             }
 
             # Apply each user defined attribute as data
@@ -48,20 +116,16 @@ class CollectMindbenderMayaRenderlayers(pyblish.api.ContextPlugin):
 
                 data[attr] = value
 
-            # Include (optional) global settings
-            # TODO(marcus): Take into account layer overrides
-            try:
-                avalon_globals = maya.lsattr("id", "avalon.renderglobals")[0]
-            except IndexError:
-                pass
-            else:
-                avalon_globals = maya.read(avalon_globals)
+            if avalon_settings is not None:
+                def avalon_global(attr):
+                    return values[avalon_globals + "." + attr]
+
                 data["renderGlobals"] = {
                     key: value for key, value in {
-                        "Pool": avalon_globals["pool"],
-                        "Group": avalon_globals["group"],
-                        "Frames": avalon_globals["frames"],
-                        "Priority": avalon_globals["priority"],
+                        "Pool": avalon_global("pool"),
+                        "Group": avalon_global("group"),
+                        "Frames": avalon_global("frames"),
+                        "Priority": avalon_global("priority"),
                     }.items()
 
                     # Here's the kicker. These globals override defaults
@@ -71,5 +135,34 @@ class CollectMindbenderMayaRenderlayers(pyblish.api.ContextPlugin):
                     if value
                 }
 
-            instance = context.create_instance(layer)
-            instance.data.update(data)
+            collection.append((layer, [], data))
+
+        return collection, watch
+
+    def overrides(self, layer):
+        """Return {node.attribute: value} of overrides made by `layer`
+
+        Each override is stored in the `adjustments` of a layer,
+        where `plug` is connected to the overridden attribute
+        and `value` holds the value used within that layer.
+
+        """
+
+        from maya import cmds
+
+        connections = cmds.listConnections(layer + ".adjustments",
+                                           plugs=True,
+                                           connections=True,
+                                           source=True,
+                                           destination=False) or []
+
+        overrides = dict()
+        for adjustment, plug in zip(connections[::2], connections[1::2]):
+            value = adjustment.rsplit(".", 1)[0] + ".value"
+
+            try:
+                overrides[plug] = cmds.getAttr(value)
+            except (ValueError, RuntimeError):
+                continue
+
+        return overrides
@@ -1,12 +1,16 @@
 import pyblish.api
 
 
-class ExtractMindbenderAnimation(pyblish.api.InstancePlugin):
+class ExtractMindbenderAnimation(pyblish.api.ContextPlugin):
     """Produce an alembic of just point positions and normals.
 
     Positions and normals are preserved, but nothing more,
     for plain and predictable point caches.
 
+    Every animation instance is exported by a single call to AbcExport,
+    with one job and one file per instance, such that the scene is
+    evaluated only once per frame.
+
     Limitations:
         - Framerange is bound to current maximum range in Maya
 
@@ -17,44 +21,50 @@ class ExtractMindbenderAnimation(pyblish.api.InstancePlugin):
     hosts = ["maya"]
     families = ["mindbender.animation"]
 
-    def process(self, instance):
+    def process(self, context):
         import os
         import polly
         from maya import cmds
-        from avalon import maya
-
-        self.log.debug("Loading plug-in..")
-        cmds.loadPlugin("AbcExport.mll", quiet=True)
-
-        self.log.info("Extracting animation..")
-        dirname = polly.format_staging_dir(
-            root=instance.context.data["workspaceDir"],
-            time=instance.context.data["time"],
-            name=instance.data["name"])
-
-        try:
-            os.makedirs(dirname)
-        except OSError:
-            pass
-
-        filename = "{name}.abc".format(**instance.data)
-
-        out_set = next((
-            node for node in instance
-            if node.endswith("out_SET")
-        ), None)
-
-        if out_set:
-            nodes = cmds.sets(out_set, query=True)
-        else:
-            # Backwards compatibility
-            nodes = list(instance)
-
-        self.log.info("nodes: %s" % str(nodes))
-        with maya.suspended_refresh():
-            maya.export_alembic(
-                nodes=nodes,
-                file=os.path.join(dirname, filename).replace("\\", "/"),
+        from polly.maya import worker
+
+        instances = [
+            instance for instance in context
+            if instance.data.get("publish", True) and
+            "mindbender.animation" in ([instance.data.get("family")] +
+                                       instance.data.get("families", []))
+        ]
+
+        jobs = list()
+        for instance in instances:
+            self.log.info("Extracting animation of %s.." % instance)
+            dirname = polly.format_staging_dir(
+                root=context.data["workspaceDir"],
+                time=context.data["time"],
+                name=instance.data["name"])
+
+            try:
+                os.makedirs(dirname)
+            except OSError:
+                pass
+
+            filename = "{name}.abc".format(**instance.data)
+
+            out_set = next((
+                node for node in instance
+                if node.endswith("out_SET")
+            ), None)
+
+            if out_set:
+                nodes = cmds.sets(out_set, query=True)
+            else:
+                # Backwards compatibility
+                nodes = list(instance)
+
+            self.log.info("nodes: %s" % str(nodes))
+
+            jobs.append(dict(
+                nodes=cmds.ls(nodes, long=True),
+                path=os.path.join(dirname, filename).replace("\\", "/"),
 
                 frame_range=(instance.data["startFrame"],
                              instance.data["endFrame"]),
@@ -67,13 +77,29 @@ class ExtractMindbenderAnimation(pyblish.api.InstancePlugin):
 
                 # Include all attributes prefixed with this
                 attribute_prefix="mb"
-            )
+            ))
+
+            # Store reference for integration
+            if "files" not in instance.data:
+                instance.data["files"] = list()
+
+            instance.data["files"].append(filename)
+            instance.data["stagingDir"] = dirname
 
-        # Store reference for integration
-        if "files" not in instance.data:
-            instance.data["files"] = list()
+        if not jobs:
+            return self.log.info("No animation instance to extract.")
 
-        instance.data["files"].append(filename)
-        instance.data["stagingDir"] = dirname
+        self.log.info("Exporting %d instance(s) in a single pass.." % (
+            len(jobs)))
+
+        if worker.enabled():
+            job = worker.submit(context, "export_alembics", jobs=jobs)
+
+            # Each instance waits on the same export
+            for instance in instances:
+                instance.data.setdefault("workerJobs", []).append(job)
+        else:
+            worker.export_alembics(jobs)
 
-        self.log.info("Extracted {instance} to {dirname}".format(**locals()))
+        self.log.info("Extracted %s" % ", ".join(
+            job["path"] for job in jobs))
@@ -10,11 +10,10 @@ class ExtractMindbenderCurves(pyblish.api.InstancePlugin):
     def process(self, instance):
         import os
         import polly
+        import polly.lib
         from maya import cmds
-        from avalon import maya
-
-        self.log.debug("Loading plug-in..")
-        cmds.loadPlugin("atomImportExport.mll", quiet=True)
+        from avalon import api, maya
+        from polly.maya import lib
 
         self.log.info("Extracting curves..")
         dirname = polly.format_staging_dir(
@@ -27,28 +26,7 @@ class ExtractMindbenderCurves(pyblish.api.InstancePlugin):
         except OSError:
             pass
 
-        filename = "{name}.curves".format(**instance.data)
-
-        options = ";".join([
-            "precision=8",
-            "statics=1",
-            "baked=1",
-            "sdk=0",
-            "constraint=0",
-            "animLayers=0",
-            "selected=selectedOnly",
-            "whichRange=1",
-            "range=1:10",
-            "hierarchy=none",
-            "controlPoints=0",
-            "useChannelBox=1",
-            "options=keys",
-            ("copyKeyCmd="
-                "-animation objects "
-                "-option keys "
-                "-hierarchy none "
-                "-controlPoints 0 ")
-        ])
+        filename = "{name}.animcurves".format(**instance.data)
 
         controls = next((
             node for node in instance
@@ -61,15 +39,31 @@ class ExtractMindbenderCurves(pyblish.api.InstancePlugin):
             self.log.warning("%s is missing a controls_SET" % instance.name)
             return
 
-        with maya.maintained_selection(), maya.without_extension():
+        # Support controllers being embedded in
+        # additional selection sets.
+        with maya.maintained_selection():
             cmds.select(controls, noExpand=False)
-            cmds.file(
-                os.path.join(dirname, filename).replace("\\", "/"),
-                force=True,
-                options=options,
-                typ="atomExport",
-                exportSelected=True
-            )
+            nodes = cmds.ls(selection=True)
+
+        # Curves are applied to whichever namespace the rig
+        # is loaded into, rather than the one it has now.
+        namespace = controls.rpartition(":")[0]
+        curves = lib.read_anim_curves(nodes, namespace=namespace)
+
+        # Optionally remove keys on linear and stepped spans,
+        # e.g. 0.0 for only those exactly in line with others.
+        tolerance = instance.data.get(
+            "keyTolerance", api.Session.get("AVALON_KEY_TOLERANCE"))
+
+        if tolerance not in (None, ""):
+            curves, ratio = polly.lib.reduce_curves(curves, float(tolerance))
+            self.log.info("Reduced keys %.1f:1 within a tolerance of %s" % (
+                ratio, tolerance))
+
+        polly.lib.write_curves(os.path.join(dirname, filename), curves)
+
+        self.log.info("Writing %d keys of %d curves" % (
+            len(curves["times"]), len(curves["curves"])))
 
         # Store reference for integration
         if "files" not in instance.data:
@@ -19,6 +19,7 @@ class ExtractMindbenderLookdev(pyblish.api.InstancePlugin):
         import os
         import json
         import polly
+        import polly.lib
 
         from maya import cmds
 
@@ -59,25 +60,38 @@ class ExtractMindbenderLookdev(pyblish.api.InstancePlugin):
 
         instance.data["files"].append(filename)
 
+        # Compact equivalent, for faster loading
+        self.log.info("Extracting compact serialisation..")
+        filename = "{name}.shaders".format(**instance.data)
+        path = os.path.join(dirname, filename)
+
+        polly.lib.write_relationships(
+            path, polly.lib.compact_relationships(relationships))
+
+        instance.data["files"].append(filename)
+
         # Write individual shaders
         # TODO(marcus): How about exporting 1 scene, and
         # maintaining a reference to the shader node name,
         # as opposed to the file?
         self.log.info("Extracting shaders..")
-        filename = "{name}.ma".format(**instance.data)
-        path = os.path.join(dirname, filename)
+        for ext in lib.scene_formats(instance.data["family"],
+                                     instance.data.get("sceneFormats")):
+            filename = "{name}.{ext}".format(ext=ext, **instance.data)
+            path = os.path.join(dirname, filename)
+
+            with maya.maintained_selection(), maya.without_extension():
+                cmds.select(relationships.keys(), replace=True, noExpand=True)
+                cmds.file(path,
+                          force=True,
+                          options="v=0;",
+                          type=lib.SCENE_TYPES[ext],
+                          preserveReferences=False,
+                          exportSelected=True,
+                          constructionHistory=False)
+
+            instance.data["files"].append(filename)
 
-        with maya.maintained_selection(), maya.without_extension():
-            cmds.select(relationships.keys(), replace=True, noExpand=True)
-            cmds.file(path,
-                      force=True,
-                      options="v=0;",
-                      type="mayaAscii",
-                      preserveReferences=False,
-                      exportSelected=True,
-                      constructionHistory=False)
-
-        instance.data["files"].append(filename)
         instance.data["stagingDir"] = dirname
 
         self.log.info("Extracted {instance} to {path}".format(**locals()))
@@ -18,8 +18,7 @@ class ExtractMindbenderModel(pyblish.api.InstancePlugin):
     def process(self, instance):
         import os
         import polly
-        from maya import cmds
-        from avalon import maya
+        from polly.maya import lib, worker
 
         dirname = polly.format_staging_dir(
             root=instance.context.data["workspaceDir"],
@@ -31,35 +30,42 @@ class ExtractMindbenderModel(pyblish.api.InstancePlugin):
         except OSError:
             pass
 
-        filename = "{name}.ma".format(**instance.data)
+        options = dict(
+            preserveReferences=False,
 
-        path = os.path.join(dirname, filename)
+            # Shader assignment is the responsibility of
+            # riggers, for animators, and lookdev, for rendering.
+            shader=False,
+
+            # Construction history inherited from collection
+            # This enables a selective export of nodes relevant
+            # to this particular plug-in.
+            constructionHistory=False
+        )
 
         # Perform extraction
         self.log.info("Performing extraction..")
-        with maya.maintained_selection(), maya.without_extension():
-            self.log.info("Extracting %s" % str(list(instance)))
-            cmds.select(instance, noExpand=True)
-            cmds.file(path,
-                      force=True,
-                      typ="mayaAscii",
-                      exportSelected=True,
-                      preserveReferences=False,
-
-                      # Shader assignment is the responsibility of
-                      # riggers, for animators, and lookdev, for rendering.
-                      shader=False,
-
-                      # Construction history inherited from collection
-                      # This enables a selective export of nodes relevant
-                      # to this particular plug-in.
-                      constructionHistory=False)
+        self.log.info("Extracting %s" % str(list(instance)))
 
         # Store reference for integration
         if "files" not in instance.data:
             instance.data["files"] = list()
 
-        instance.data["files"].append(filename)
-        instance.data["stagingDir"] = dirname
+        for ext in lib.scene_formats(instance.data["family"],
+                                     instance.data.get("sceneFormats")):
+            filename = "{name}.{ext}".format(ext=ext, **instance.data)
+            path = os.path.join(dirname, filename)
+            typ = lib.SCENE_TYPES[ext]
+
+            if worker.enabled():
+                instance.data.setdefault("workerJobs", []).append(
+                    worker.submit(instance.context, "export_selected",
+                                  nodes=list(instance), path=path, typ=typ,
+                                  **options))
+            else:
+                worker.export_selected(list(instance), path, typ, **options)
 
-        self.log.info("Extracted {instance} to {path}".format(**locals()))
+            instance.data["files"].append(filename)
+            self.log.info("Extracted {instance} to {path}".format(**locals()))
+
+        instance.data["stagingDir"] = dirname
@@ -18,8 +18,7 @@ class ExtractMindbenderRig(pyblish.api.InstancePlugin):
     def process(self, instance):
         import os
         import polly
-        from maya import cmds
-        from avalon import maya
+        from polly.maya import lib, worker
 
         dirname = polly.format_staging_dir(
             root=instance.context.data["workspaceDir"],
@@ -31,26 +30,33 @@ class ExtractMindbenderRig(pyblish.api.InstancePlugin):
         except OSError:
             pass
 
-        filename = "{name}.ma".format(**instance.data)
-
-        path = os.path.join(dirname, filename)
+        options = dict(
+            preserveReferences=False,
+            constructionHistory=True
+        )
 
         # Perform extraction
         self.log.info("Performing extraction..")
-        with maya.maintained_selection(), maya.without_extension():
-            cmds.select(instance, noExpand=True)
-            cmds.file(path,
-                      force=True,
-                      typ="mayaAscii",
-                      exportSelected=True,
-                      preserveReferences=False,
-                      constructionHistory=True)
 
         # Store reference for integration
         if "files" not in instance.data:
             instance.data["files"] = list()
 
-        instance.data["files"].append(filename)
-        instance.data["stagingDir"] = dirname
+        for ext in lib.scene_formats(instance.data["family"],
+                                     instance.data.get("sceneFormats")):
+            filename = "{name}.{ext}".format(ext=ext, **instance.data)
+            path = os.path.join(dirname, filename)
+            typ = lib.SCENE_TYPES[ext]
+
+            if worker.enabled():
+                instance.data.setdefault("workerJobs", []).append(
+                    worker.submit(instance.context, "export_selected",
+                                  nodes=list(instance), path=path, typ=typ,
+                                  **options))
+            else:
+                worker.export_selected(list(instance), path, typ, **options)
 
-        self.log.info("Extracted {instance} to {path}".format(**locals()))
+            instance.data["files"].append(filename)
+            self.log.info("Extracted {instance} to {path}".format(**locals()))
+
+        instance.data["stagingDir"] = dirname
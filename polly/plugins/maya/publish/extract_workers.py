@@ -0,0 +1,33 @@
+import pyblish.api
+
+
+class ExtractMindbenderWorkers(pyblish.api.InstancePlugin):
+    """Wait for extraction performed in the background to finish
+
+    Extractors hand their exports to mayapy workers when background
+    extraction is enabled, see :mod:`polly.maya.worker`. Integration
+    may only start once every one of them has finished, so the session
+    remains busy until then; exports overlap with the remaining
+    extraction, rather than with the artist's work.
+
+    """
+
+    label = "Wait for Workers"
+    order = pyblish.api.ExtractorOrder + 0.4
+    hosts = ["maya"]
+
+    def process(self, instance):
+        from polly.maya import worker
+
+        jobs = instance.data.get("workerJobs", [])
+
+        for job in jobs:
+            self.log.info("Waiting for %s.." % job.function)
+            job.wait()
+
+        if jobs:
+            self.log.info("%d export(s) of \"%s\" finished" % (
+                len(jobs), instance))
+
+            # Once the last of them has finished
+            worker.cleanup(instance.context)
@@ -0,0 +1,122 @@
+import pyblish.api
+
+from polly.maya import lib
+
+
+class SelectInvalidComponents(pyblish.api.Action):
+    label = "Select Invalid Components"
+    on = "failed"
+
+    def process(self, context, plugin):
+        from maya import cmds
+        cmds.select(plugin.components)
+
+
+class ValidateMindbenderGeometryHealth(pyblish.api.InstancePlugin):
+    """Meshes must be free of degenerate and non-manifold components
+
+    - No vertex may be positioned at NaN or infinity
+    - No face may be without area
+    - No face may share all of its vertices with another face (lamina)
+    - No edge may be shared by more than two faces (non-manifold)
+
+    Points and faces of each mesh are read in bulk and checked
+    all at once, see :func:`polly.lib.check_geometry`.
+
+    """
+
+    label = "Geometry Health"
+    order = pyblish.api.ValidatorOrder
+    hosts = ["maya"]
+    families = ["mindbender.model"]
+    actions = [
+        pyblish.api.Category("Actions"),
+        SelectInvalidComponents,
+    ]
+
+    components = []
+
+    @lib.skip_unchanged("topology", "points")
+    def process(self, instance):
+        from maya import cmds
+        from maya.api import OpenMaya as om
+        from polly import lib as polly_lib
+
+        meshes = cmds.ls(instance, type="mesh", long=True, noIntermediate=True)
+        meshes += cmds.ls(cmds.listRelatives(instance,
+                                             allDescendents=True,
+                                             fullPath=True) or [],
+                          type="mesh",
+                          long=True,
+                          noIntermediate=True)
+
+        selection = om.MSelectionList()
+        for mesh in sorted(set(meshes)):
+            selection.add(mesh)
+
+        self.components[:] = []
+
+        for index in range(selection.length()):
+            path = selection.getDagPath(index)
+            mesh = path.fullPathName()
+            fn = om.MFnMesh(path)
+
+            # Read as flat lists, once per mesh
+            counts, vertices = fn.getVertices()
+            points = cmds.xform(mesh + ".vtx[*]",
+                                query=True,
+                                objectSpace=True,
+                                translation=True) if fn.numVertices else []
+
+            invalid = polly_lib.check_geometry(points,
+                                               list(counts),
+                                               list(vertices))
+
+            if invalid["nonManifoldEdges"]:
+                invalid["nonManifoldEdges"] = self.edges(
+                    path, invalid["nonManifoldEdges"])
+
+            for check, component in (("nanVertices", "vtx"),
+                                     ("zeroAreaFaces", "f"),
+                                     ("laminaFaces", "f"),
+                                     ("nonManifoldEdges", "e")):
+                if not invalid[check]:
+                    continue
+
+                self.log.error("%s: %d %s" % (
+                    mesh, len(invalid[check]), check))
+
+                self.components.extend(
+                    "%s.%s[%d:%d]" % (mesh, component, first, last)
+                    for first, last in polly_lib.ranges(invalid[check])
+                )
+
+        assert not self.components, (
+            "\"%s\" has unhealthy geometry, see log for details" % instance)
+
+        self.log.info("The geometry of \"%s\" is healthy." % instance)
+
+    def edges(self, path, pairs):
+        """Return indices of edges between each of `pairs` of vertices
+
+        Arguments:
+            path (MDagPath): Path to mesh
+            pairs (list): (vertex, vertex) pairs, lowest index first
+
+        """
+
+        from maya.api import OpenMaya as om
+
+        pairs = set(pairs)
+        edges = list()
+
+        # A single pass over every edge of the mesh
+        it = om.MItMeshEdge(path)
+        while not it.isDone():
+            first, second = it.vertexId(0), it.vertexId(1)
+            if (min(first, second), max(first, second)) in pairs:
+                edges.append(it.index())
+
+            it.next()
+
+        return edges
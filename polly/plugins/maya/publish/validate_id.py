@@ -13,30 +13,24 @@ class ValidateMindbenderID(pyblish.api.InstancePlugin):
     ]
 
     def process(self, instance):
-        from maya import cmds
+        from polly.maya import lib
 
-        nodes = list(instance)
-        nodes += cmds.listRelatives(instance, allDescendents=True) or list()
+        snapshot = (instance.data.get("dagSnapshot") or
+                    lib.dag_snapshot(instance))
         missing = list()
 
-        for node in nodes:
+        for node, entry in sorted(snapshot.items()):
 
             # Only check transforms with shapes that are meshes
-            if not cmds.nodeType(node) == "transform":
+            if not entry["type"] == "transform":
                 continue
 
-            shapes = cmds.listRelatives(node,
-                                        shapes=True,
-                                        type="mesh") or list()
-            meshes = cmds.ls(shapes, type="mesh")
-
-            if not meshes:
+            if not any(snapshot[shape]["type"] == "mesh"
+                       for shape in entry["shapes"]):
                 continue
 
-            try:
-                self.log.info("Checking '%s'" % node)
-                cmds.getAttr(node + ".mbID")
-            except ValueError:
+            self.log.info("Checking '%s'" % node)
+            if entry["id"] is None:
                 missing.append(node)
 
         assert not missing, ("Missing ID attribute on: %s"
@@ -14,7 +14,15 @@ class ValidateMindbenderModelHierarchy(pyblish.api.InstancePlugin):
     families = ["mindbender.model"]
 
     def process(self, instance):
-        from maya import cmds
+        from polly.maya import lib
 
-        assert cmds.ls(instance, assemblies=True) == ["ROOT"], (
+        snapshot = (instance.data.get("dagSnapshot") or
+                    lib.dag_snapshot(instance))
+
+        assemblies = [
+            node.rsplit("|", 1)[-1] for node, entry in snapshot.items()
+            if entry["member"] and entry["dag"] and entry["parent"] is None
+        ]
+
+        assert assemblies == ["ROOT"], (
             "Model must have a single parent called 'ROOT'.")
@@ -18,14 +18,15 @@ class ValidateMindbenderNormals(pyblish.api.InstancePlugin):
     def process(self, instance):
         from maya import cmds
 
-        invalid = list()
-        for mesh in cmds.ls(instance, type="mesh", long=True):
-            faces = cmds.polyListComponentConversion(mesh, toVertexFace=True)
-            locked = cmds.polyNormalPerVertex(faces,
-                                              query=True,
-                                              freezeNormal=True)
-
-            invalid.append(mesh) if any(locked) else None
+        meshes = cmds.ls(instance, type="mesh", long=True)
+
+        # A single query of every vertex per mesh
+        invalid = [
+            mesh for mesh in meshes
+            if any(cmds.polyNormalPerVertex(mesh + ".vtx[*]",
+                                            query=True,
+                                            freezeNormal=True) or [])
+        ]
 
         # On locked normals, indicate that validation has failed
         # with a friendly message for the user.
@@ -19,6 +19,7 @@ class ValidateMindbenderRigFormat(pyblish.api.InstancePlugin):
 
     def process(self, instance):
         from maya import cmds
+        from polly.maya import lib
 
         missing = list()
 
@@ -34,21 +35,35 @@ class ValidateMindbenderRigFormat(pyblish.api.InstancePlugin):
         # As user may inadvertently add to the out_SET without
         # realising, and some of the new members may be non-meshes,
         # or meshes without and ID
+        snapshot = dict(instance.data.get("dagSnapshot") or
+                        lib.dag_snapshot(instance))
+
+        # Components, e.g. faces, are checked by the transform
+        # of the shape they belong to, like shapes themselves.
+        members = cmds.ls(cmds.sets("out_SET", query=True) or list(),
+                          objectsOnly=True,
+                          long=True)
+        shapes = cmds.ls(members, shapes=True, long=True)
+        if shapes:
+            members = sorted(set(members) - set(shapes) | set(
+                cmds.listRelatives(shapes, parent=True, fullPath=True)))
+
+        # Members outside of the instance hierarchy
+        snapshot.update(lib.dag_snapshot(
+            [member for member in members if member not in snapshot]))
+
         missing = list()
 
-        for node in cmds.sets("out_SET", query=True) or list():
+        for node in members:
+            entry = snapshot[node]
 
             # Only check transforms with shapes that are meshes
-            shapes = cmds.listRelatives(node, shapes=True) or list()
-            meshes = cmds.ls(shapes, type="mesh")
-
-            if not meshes:
+            if not any(snapshot[shape]["type"] == "mesh"
+                       for shape in entry["shapes"]):
                 continue
 
-            try:
-                self.log.info("Checking '%s'" % node)
-                cmds.getAttr(node + ".mbID")
-            except ValueError:
+            self.log.info("Checking '%s'" % node)
+            if entry["id"] is None:
                 missing.append(node)
 
         assert not missing, ("Missing ID attribute on: %s"
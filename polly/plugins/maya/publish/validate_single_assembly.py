@@ -13,9 +13,9 @@ class SelectAssemblies(pyblish.api.Action):
 class ValidateMindbenderSingleAssembly(pyblish.api.InstancePlugin):
     """Each asset must have a single top-level group
 
-    The given instance is test-exported, along with construction
-    history to test whether more than 1 top-level DAG node would
-    be included in the exported file.
+    The upstream history of the given instance, and of the shaders
+    assigned to it, is traversed to test whether more than 1 top-level
+    DAG node would be included in an export with construction history.
 
     """
 
@@ -32,18 +32,44 @@ class ValidateMindbenderSingleAssembly(pyblish.api.InstancePlugin):
 
     def process(self, instance):
         from maya import cmds
-        from avalon import maya
-
-        with maya.maintained_selection():
-            cmds.select(instance, replace=True)
-            nodes = cmds.file(
-                constructionHistory=True,
-                exportSelected=True,
-                preview=True,
-                force=True,
-            )
 
-        self.assemblies[:] = cmds.ls(nodes, assemblies=True)
+        # Members along with everything beneath them
+        nodes = cmds.ls(instance, long=True)
+        nodes += cmds.ls(nodes, dag=True, long=True) if nodes else []
+
+        # Shaders are exported alongside the shapes they are assigned to.
+        # Their history is traversed from the shaders rather than from
+        # their shading engines, whose history includes every other
+        # shape assigned to them.
+        shapes = cmds.ls(nodes, shapes=True) if nodes else []
+        engines = set()
+        if shapes:
+            engines.update(cmds.listConnections(shapes,
+                                                type="shadingEngine",
+                                                source=False,
+                                                destination=True) or list())
+
+        if engines:
+            nodes += cmds.listConnections(
+                ["%s.%s" % (engine, attr)
+                 for engine in engines
+                 for attr in ("surfaceShader",
+                              "volumeShader",
+                              "displacementShader")],
+                source=True,
+                destination=False) or list()
+
+        if nodes:
+            nodes += cmds.listHistory(nodes) or list()
+
+        # The top-level node of each DAG node included.
+        # Note that an empty list would make `ls` list every node.
+        assemblies = sorted(set(
+            "|" + node.split("|")[1]
+            for node in cmds.ls(nodes, long=True, type="dagNode")
+        )) if nodes else []
+
+        self.assemblies[:] = cmds.ls(assemblies) if assemblies else []
 
         if not self.assemblies:
             raise Exception("No assembly found.")
@@ -16,19 +16,22 @@ class ValidateMindbenderSingleShape(pyblish.api.InstancePlugin):
     ]
 
     def process(self, instance):
-        from maya import cmds
+        from polly.maya import lib
 
-        has_multiple_shapes = list()
+        snapshot = (instance.data.get("dagSnapshot") or
+                    lib.dag_snapshot(instance))
 
-        # Consider entire hierarchy of nodes included in an Instance
-        hierarchy = cmds.listRelatives(instance, allDescendents=True)
+        has_multiple_shapes = list()
 
-        # Consider only nodes of type="mesh"
-        meshes = cmds.ls(hierarchy, type="mesh", long=True)
-        transforms = cmds.listRelatives(meshes, parent=True)
+        # Consider only nodes of type="mesh", within
+        # the entire hierarchy of nodes included in an Instance
+        transforms = set(
+            entry["parent"] for entry in snapshot.values()
+            if entry["type"] == "mesh" and entry["parent"] in snapshot
+        )
 
-        for transform in set(transforms):
-            shapes = cmds.listRelatives(transform, shapes=True) or list()
+        for transform in sorted(transforms):
+            shapes = snapshot[transform]["shapes"]
 
             # Ensure the one child is a shape
             has_single_shape = len(shapes) == 1
@@ -37,7 +40,7 @@ class ValidateMindbenderSingleShape(pyblish.api.InstancePlugin):
             # Ensure the one shape is of type "mesh"
             has_single_mesh = (
                 has_single_shape and
-                cmds.nodeType(shapes[0]) == "mesh"
+                snapshot[shapes[0]]["type"] == "mesh"
             )
             self.log.info("has single mesh: %s" % has_single_mesh)
 
@@ -2,7 +2,12 @@ import pyblish.api
 
 
 class CollectMindbenderImageSequences(pyblish.api.ContextPlugin):
-    """Gather image sequnences from working directory"""
+    """Gather image sequnences from working directory
+
+    In progressive mode, frames still being written are left out
+    and collected on a subsequent publish instead.
+
+    """
 
     order = pyblish.api.CollectorOrder
     hosts = ["shell"]
@@ -11,11 +16,24 @@ class CollectMindbenderImageSequences(pyblish.api.ContextPlugin):
     def process(self, context):
         import os
         import json
+        from avalon import api
         from avalon.vendor import clique
+        from polly import lib
 
         workspace = context.data["workspaceDir"]
+        progressive = bool(context.data.get("progressive") or
+                           api.Session.get("AVALON_PROGRESSIVE"))
+
+        base, dirs, files = next(os.walk(workspace))
+
+        # Every submitted layer, including those yet to
+        # output a single frame, has its metadata written
+        # alongside its directory of frames.
+        context.data["renderlayers"] = sorted(
+            fname[:-len(".json")] for fname in files
+            if fname.endswith(".json")
+        )
 
-        base, dirs, _ = next(os.walk(workspace))
         for renderlayer in dirs:
             abspath = os.path.join(base, renderlayer)
             files = os.listdir(abspath)
@@ -32,16 +50,41 @@ class CollectMindbenderImageSequences(pyblish.api.ContextPlugin):
                 try:
                     with open(fname + ".json") as f:
                         metadata = json.load(f)
+                    layer = os.path.basename(fname)
                     break
 
-                except OSError:
+                except (IOError, OSError):
                     continue
 
             else:
                 raise Exception("%s was not published correctly "
                                 "(missing metadata)" % renderlayer)
 
+            # Frames expected once the render has finished
+            start, end, step = (
+                int(metadata["instance"][key])
+                for key in ("startFrame", "endFrame", "byFrameStep")
+            )
+            expected = set(range(start, end + 1, step))
+
             for collection in collections:
+                files = list(collection)
+                frames = dict(zip(files, collection.indexes))
+                pending = set()
+
+                if progressive:
+                    pending = set(
+                        fname for fname in files
+                        if lib.check_image(os.path.join(abspath, fname))
+                    )
+                    files = [fname for fname in files
+                             if fname not in pending]
+
+                    if not files:
+                        self.log.info("%s has no finished frames yet."
+                                      % collection)
+                        continue
+
                 instance = context.create_instance(str(collection))
 
                 data = dict(metadata["instance"], **{
@@ -50,8 +93,13 @@ class CollectMindbenderImageSequences(pyblish.api.ContextPlugin):
                     "families": ["mindbender.imagesequence"],
                     "subset": collection.head[:-1],
                     "stagingDir": os.path.join(workspace, renderlayer),
-                    "files": [list(collection)],
-                    "metadata": metadata
+                    "files": [files],
+                    "metadata": metadata,
+                    "progressive": progressive,
+                    "renderlayer": layer,
+                    "pendingFrames": len(pending),
+                    "missingFrames": sorted(
+                        expected - set(frames[fname] for fname in files)),
                 })
 
                 instance.data.update(data)
@@ -8,6 +8,9 @@ class IntegrateAvalonAsset(pyblish.api.InstancePlugin):
     This plug-in exposes your data to others by encapsulating it
     into a new version.
 
+    Instances are integrated one at a time, such that a failed
+    integration prevents any subsequent one per its atomicity.
+
     """
 
     label = "Asset"
@@ -93,14 +96,41 @@ class IntegrateAvalonAsset(pyblish.api.InstancePlugin):
 
         latest_version = io.find_one({"type": "version",
                                       "parent": subset["_id"]},
-                                     {"name": True},
+                                     {"name": True,
+                                      "data.complete": True,
+                                      "data.jobs": True},
                                      sort=[("name", -1)])
 
         next_version = 1
         if latest_version is not None:
             next_version += latest_version["name"]
 
-        self.log.debug("Next version: %i" % next_version)
+        # Progressive
+        #
+        # Frames are integrated into the same version as they land,
+        # until the version is marked complete.
+        #
+        progressive = instance.data.get("progressive", False)
+        latest_data = (latest_version or {}).get("data", {})
+
+        # Versions belong to the render jobs they were published from,
+        # an incomplete version of any other render is left as-is.
+        jobs = sorted(job["_id"] for job in
+                      instance.data.get("metadata", {}).get("jobs", []))
+        same_render = progressive and latest_data.get("jobs") == jobs
+        resume = same_render and latest_data.get("complete") is False
+
+        if same_render and latest_data.get("complete"):
+            self.log.info("Version %i is already complete"
+                          % latest_version["name"])
+            instance.data["complete"] = True
+            return
+
+        if resume:
+            next_version = latest_version["name"]
+            self.log.info("Resuming incomplete version: %i" % next_version)
+        else:
+            self.log.debug("Next version: %i" % next_version)
 
         version = {
             "schema": "avalon-core:version-2.0",
@@ -126,8 +156,16 @@ class IntegrateAvalonAsset(pyblish.api.InstancePlugin):
             }
         }
 
-        self.log.debug("Creating version: %s" % pformat(version))
-        version_id = io.insert_one(version).inserted_id
+        if resume:
+            version_id = latest_version["_id"]
+
+        else:
+            if progressive:
+                version["data"]["complete"] = False
+                version["data"]["jobs"] = jobs
+
+            self.log.debug("Creating version: %s" % pformat(version))
+            version_id = io.insert_one(version).inserted_id
 
         # Write to disk
         #          _
@@ -205,6 +243,13 @@ class IntegrateAvalonAsset(pyblish.api.InstancePlugin):
                         fname
                     )
 
+                    # Frames already integrated, unless since re-rendered
+                    if resume and os.path.exists(dst):
+                        if self.unchanged(src, dst):
+                            continue
+
+                        os.remove(dst)
+
                     copy(src, dst)
 
                     instance.data["output"].append(dst)
@@ -250,9 +295,39 @@ class IntegrateAvalonAsset(pyblish.api.InstancePlugin):
                 }
             }
 
+            if resume and io.find_one({
+                    "type": "representation",
+                    "parent": version_id,
+                    "name": representation["name"]}):
+                continue
+
             io.insert_one(representation)
 
+        if progressive and instance.data.get("renderComplete"):
+            # Deadline is queried after frames are collected, such that
+            # frames finished in between are yet to be integrated.
+            if instance.data.get("pendingFrames"):
+                self.log.info("Waiting for %d frames to finish writing"
+                              % instance.data["pendingFrames"])
+            elif instance.data.get("missingFrames"):
+                self.log.info("Waiting for %d frames to be collected"
+                              % len(instance.data["missingFrames"]))
+            else:
+                self.log.info("Final frames integrated, "
+                              "marking version complete")
+                io.update_many({"_id": version_id},
+                               {"$set": {"data.complete": True}})
+                instance.data["complete"] = True
+
         context.data["published_version"] = str(version_id)
 
         self.log.info("Successfully integrated \"%s\" to \"%s\"" % (
             instance, dst))
+
+
+    def unchanged(self, src, dst):
+        """Return whether `dst` is an up-to-date copy of `src`"""
+        import os
+
+        src, dst = os.stat(src), os.stat(dst)
+        return src.st_size == dst.st_size and src.st_mtime <= dst.st_mtime
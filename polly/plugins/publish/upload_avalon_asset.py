@@ -14,6 +14,7 @@ class UploadAvalonAsset(api.InstancePlugin):
     order = api.IntegratorOrder + 0.1
     depends = ["IntegrateAvalonAsset"]
     optional = True
+    concurrent = True
 
     active = bool(Session.get("AVALON_UPLOAD"))
 
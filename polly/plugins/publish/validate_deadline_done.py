@@ -2,13 +2,19 @@ import pyblish.api
 
 
 class ValidateMindbenderDeadlineDone(pyblish.api.InstancePlugin):
-    """Ensure render is finished before publishing the resulting images"""
+    """Ensure render is finished before publishing the resulting images
+
+    Progressive publishes are permitted while a render is still active
+    or pending; the render is then recorded as incomplete.
+
+    """
 
     label = "Rendered Successfully"
     order = pyblish.api.ValidatorOrder
     hosts = ["shell"]
     families = ["mindbender.imagesequence"]
     optional = True
+    concurrent = True
 
     def process(self, instance):
         from avalon import api
@@ -31,6 +37,10 @@ class ValidateMindbenderDeadlineDone(pyblish.api.InstancePlugin):
         AVALON_DEADLINE = api.Session["AVALON_DEADLINE"]
         url = "{}/api/jobs?JobID=%s".format(AVALON_DEADLINE)
 
+        # Progressive publishes integrate frames as they finish
+        progressive = instance.data.get("progressive", False)
+        complete = True
+
         for job in instance.data["metadata"]["jobs"]:
             response = requests.get(url % job["_id"])
 
@@ -44,6 +54,10 @@ class ValidateMindbenderDeadlineDone(pyblish.api.InstancePlugin):
                 if state in (None, "Unknown"):
                     raise Exception("State of this render is unknown")
 
+                elif state in ("Active", "Pending") and progressive:
+                    self.log.info("%s is still rendering" % instance)
+                    complete = False
+
                 elif state == "Active":
                     raise Exception("This render is still currently active")
 
@@ -61,3 +75,5 @@ class ValidateMindbenderDeadlineDone(pyblish.api.InstancePlugin):
             else:
                 raise Exception("Could not determine the current status "
                                 " of this render")
+
+        instance.data["renderComplete"] = complete
@@ -0,0 +1,39 @@
+import pyblish.api
+
+
+class ValidateMindbenderImageHeaders(pyblish.api.InstancePlugin):
+    """Rendered frames must be complete
+
+    Corrupt or partially written frames are detected by inspecting
+    the header and structure of each frame, without reading the
+    pixels themselves.
+
+    """
+
+    label = "Image Headers"
+    order = pyblish.api.ValidatorOrder
+    hosts = ["shell"]
+    families = ["mindbender.imagesequence"]
+    optional = True
+
+    def process(self, instance):
+        import os
+        from polly import lib
+
+        stagingdir = instance.data["stagingDir"]
+
+        paths = list()
+        for _ in instance.data["files"]:
+            for fname in (_ if isinstance(_, list) else [_]):
+                paths.append(os.path.join(stagingdir, fname))
+
+        self.log.info("Checking %d frames.." % len(paths))
+        invalid = lib.check_images(paths)
+
+        for path, reason in invalid:
+            self.log.error("%s: %s" % (os.path.basename(path), reason))
+
+        assert not invalid, (
+            "%d of %d frames in \"%s\" were broken" % (
+                len(invalid), len(paths), instance)
+        )
@@ -0,0 +1,251 @@
+"""Measure where time goes during publishing
+
+Usage:
+    >>> from polly import profiling
+    >>> with profiling.Profiler() as profiler:  # doctest: +SKIP
+    ...     context = pyblish.util.publish()
+    ...
+    >>> print(profiler.summary())  # doctest: +SKIP
+
+Each processed pair of plug-in and instance is measured in
+wall time, CPU time, growth of peak memory and, when run inside
+of Maya, the number of calls made to each command of `maya.cmds`.
+
+Peak memory is that of the process as a whole, as reported by the
+operating system; in kilobytes on Linux and bytes on macOS. Each
+record holds how much it rose whilst processing, as "memoryIncrease".
+
+"""
+
+import os
+import json
+import time
+import logging
+import functools
+
+from pyblish import api as pyblish
+
+try:
+    import resource
+except ImportError:
+    # Unavailable on Windows
+    resource = None
+
+log = logging.getLogger(__name__)
+
+
+def _cpu_time():
+    user, system = os.times()[:2]
+    return user + system
+
+
+def _peak_memory():
+    """Return peak memory of this process thus far, or None
+
+    The unit is kilobytes on Linux and bytes on macOS.
+
+    """
+    if resource is None:
+        return None
+
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _sum(*values):
+    """Return sum of `values`, ignoring those that are None"""
+    values = [value for value in values if value is not None]
+    return sum(values) if values else None
+
+
+class Profiler(object):
+    """Record cost of each plug-in processed whilst active
+
+    Plug-ins are processed one at a time, so the cost of each
+    is whatever was spent since the previous one finished.
+
+    """
+
+    def __init__(self):
+        self.records = list()
+
+        self._cpu = None
+        self._peak = None
+        self._calls = dict()
+        self._originals = dict()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def start(self):
+        self.records[:] = []
+        self._cpu = _cpu_time()
+        self._peak = _peak_memory()
+        self._wrap_commands()
+        pyblish.register_callback("pluginProcessed", self._on_processed)
+
+    def stop(self):
+        pyblish.deregister_callback("pluginProcessed", self._on_processed)
+        self._unwrap_commands()
+
+    def _on_processed(self, result):
+        cpu = _cpu_time()
+        peak = _peak_memory()
+
+        self.records.append({
+            "plugin": result["plugin"].__name__,
+            "instance": (str(result["instance"])
+                         if result["instance"] is not None else None),
+            "success": result["success"],
+
+            # Measured by pyblish, in milliseconds
+            "wallTime": result.get("duration", 0) / 1000.0,
+            "cpuTime": cpu - self._cpu,
+            "memoryIncrease": (peak - self._peak
+                               if None not in (peak, self._peak) else None),
+            "commands": dict(self._calls),
+        })
+
+        self._cpu = cpu
+        self._peak = peak
+        self._calls.clear()
+
+    def _wrap_commands(self):
+        try:
+            from maya import cmds
+        except ImportError:
+            return
+
+        def counted(name, func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                self._calls[name] = self._calls.get(name, 0) + 1
+                return func(*args, **kwargs)
+            return wrapper
+
+        for name in dir(cmds):
+            func = getattr(cmds, name)
+
+            if name.startswith("_") or not callable(func):
+                continue
+
+            self._originals[name] = func
+            setattr(cmds, name, counted(name, func))
+
+    def _unwrap_commands(self):
+        if not self._originals:
+            return
+
+        from maya import cmds
+
+        for name, func in self._originals.items():
+            setattr(cmds, name, func)
+
+        self._originals.clear()
+
+    def report(self):
+        """Return records, along with totals per plug-in and instance"""
+        def total(key):
+            totals = dict()
+
+            for record in self.records:
+                name = record[key]
+                if name is None:
+                    continue
+
+                entry = totals.setdefault(name, {
+                    "wallTime": 0.0,
+                    "cpuTime": 0.0,
+                    "commands": 0,
+                    "memoryIncrease": None,
+                })
+
+                entry["wallTime"] += record["wallTime"]
+                entry["cpuTime"] += record["cpuTime"]
+                entry["commands"] += sum(record["commands"].values())
+                entry["memoryIncrease"] = _sum(entry["memoryIncrease"],
+                                               record["memoryIncrease"])
+
+            return totals
+
+        return {
+            "schema": "polly:profile-1.0",
+            "wallTime": sum(r["wallTime"] for r in self.records),
+            "cpuTime": sum(r["cpuTime"] for r in self.records),
+            "peakMemory": self._peak,
+            "memoryIncrease": _sum(*[r["memoryIncrease"]
+                                     for r in self.records]),
+            "plugins": total("plugin"),
+            "instances": total("instance"),
+            "records": self.records,
+        }
+
+    def write(self, path):
+        """Write report as JSON to `path`"""
+        dirname = os.path.dirname(path)
+        if dirname and not os.path.isdir(dirname):
+            os.makedirs(dirname)
+
+        with open(path, "w") as f:
+            json.dump(self.report(), f, indent=4, sort_keys=True)
+
+    def summary(self, limit=10):
+        """Return the `limit` most expensive plug-ins as text"""
+        report = self.report()
+
+        header = "{:<40}{:>10}{:>10}{:>10}{:>10}".format(
+            "Plug-in", "Wall", "CPU", "Commands", "Memory")
+        row = ("{:<40}{wallTime:>9.2f}s{cpuTime:>9.2f}s"
+               "{commands:>10}{memory:>10}")
+
+        plugins = sorted(report["plugins"].items(),
+                         key=lambda item: item[1]["wallTime"],
+                         reverse=True)
+
+        def memory(entry):
+            increase = entry["memoryIncrease"]
+            return "-" if increase is None else "+%d" % increase
+
+        lines = [header, "-" * 80]
+        lines += [row.format(name, memory=memory(entry), **entry)
+                  for name, entry in plugins[:limit]]
+        lines += ["-" * 80,
+                  "{:<40}{:>9.2f}s{:>9.2f}s".format(
+                      "Total", report["wallTime"], report["cpuTime"])]
+
+        return "\n".join(lines)
+
+
+def publish(context=None):
+    """Publish with profiling, writing a report to the staging directory
+
+    The report is written as JSON to
+    {workspaceDir}/stage/profile-{time}.json
+
+    Arguments:
+        context (pyblish.api.Context, optional): Publish this context
+
+    Returns:
+        context of publish
+
+    """
+
+    from pyblish import util
+
+    with Profiler() as profiler:
+        context = util.publish(context)
+
+    log.info("Publish profile:\n%s" % profiler.summary())
+
+    root = context.data.get("workspaceDir")
+    if root:
+        path = os.path.join(root, "stage", "profile-%s.json" % (
+            context.data.get("time") or time.strftime("%Y%m%dT%H%M%SZ",
+                                                      time.gmtime())))
+        profiler.write(path)
+        log.info("Profile written to %s" % path)
+
+    return context
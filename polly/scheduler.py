@@ -0,0 +1,164 @@
+"""Publish with instances processed concurrently
+
+Plug-ins spending most of their time waiting on disk or network,
+and safe to run from multiple threads at once, may be marked with
+`concurrent = True`. Consecutive such plug-ins of the same stage -
+collection, validation, extraction or integration - are processed
+per instance, with each instance running through them in a thread
+of its own. Other plug-ins are processed one at a time, as usual.
+
+Each stage finishes before the next one starts, such that e.g.
+no instance is integrated before every instance has been validated.
+
+Usage:
+    >>> from polly import scheduler
+    >>> context = scheduler.publish()  # doctest: +SKIP
+
+"""
+
+import logging
+import threading
+import itertools
+from multiprocessing.pool import ThreadPool
+
+from pyblish import api, logic, plugin, util
+
+log = logging.getLogger(__name__)
+
+
+def _stage(Plugin):
+    """Return stage of `Plugin`, 0 for collection, 1 for validation etc."""
+    return int((Plugin.order + 0.5) // 1)
+
+
+def _is_concurrent(Plugin):
+    return (getattr(Plugin, "concurrent", False) and
+            issubclass(Plugin, api.InstancePlugin))
+
+
+def publish(context=None, plugins=None, workers=8):
+    """Publish, processing instances of concurrent plug-ins in parallel
+
+    Arguments:
+        context (pyblish.api.Context, optional): Publish this context
+        plugins (list, optional): Plug-ins to process,
+            defaults to results of discover()
+        workers (int, optional): Maximum number of instances
+            processed at once, default 8.
+
+    Returns:
+        context of publish
+
+    """
+
+    context = api.Context() if context is None else context
+    plugins = api.discover() if plugins is None else plugins
+    plugins = list(Plugin for Plugin in plugins if Plugin.active)
+
+    # Collection determines which instances there are,
+    # and is therefore processed one plug-in at a time.
+    collectors = list(Plugin for Plugin in plugins if _stage(Plugin) < 1)
+    util.collect(context, plugins=collectors)
+
+    plugins = list(Plugin for Plugin in plugins if Plugin not in collectors)
+
+    # Exclude plug-ins that do not have at
+    # least one compatible instance.
+    plugins = list(
+        Plugin for Plugin in plugins
+        if not Plugin.__instanceEnabled__ or
+        logic.instances_by_plugin(context, Plugin)
+    )
+
+    # Mutable state, as used by pyblish.logic.Iterator
+    state = {
+        "nextOrder": None,
+        "ordersWithError": set()
+    }
+
+    test = api.registered_test()
+    pool = ThreadPool(workers)
+
+    try:
+        for _, stage in itertools.groupby(plugins, key=_stage):
+            for concurrent, batch in itertools.groupby(stage,
+                                                       key=_is_concurrent):
+                batch = list(batch)
+
+                for Plugin in batch:
+                    state["nextOrder"] = Plugin.order
+
+                    message = test(**state)
+                    if message:
+                        log.error("Stopped due to %s" % message)
+                        return context
+
+                if concurrent:
+                    _process_concurrently(batch, context, state, pool)
+
+                else:
+                    for Plugin, instance in logic.Iterator(batch,
+                                                           context,
+                                                           state):
+                        result = plugin.process(Plugin, context, instance)
+
+                        if result["error"]:
+                            state["ordersWithError"].add(Plugin.order)
+
+    finally:
+        pool.close()
+        pool.join()
+
+    api.emit("published", context=context)
+
+    return context
+
+
+def _process_concurrently(plugins, context, state, pool):
+    """Run each instance through `plugins` in a thread of its own"""
+
+    compatible = dict(
+        (Plugin, logic.instances_by_plugin(context, Plugin))
+        for Plugin in plugins
+    )
+
+    pipelines = list()
+    for instance in context:
+        if instance.data.get("publish") is False:
+            continue
+
+        pipeline = list(Plugin for Plugin in plugins
+                        if instance in compatible[Plugin])
+
+        if pipeline:
+            pipelines.append((instance, pipeline))
+
+    def run(pipeline):
+        instance, pipeline = pipeline
+        ident = threading.current_thread().ident
+
+        for Plugin in pipeline:
+            result = plugin.process(Plugin, context, instance)
+
+            # Records are gathered from the global logger,
+            # and so include those of other threads.
+            result["records"][:] = [
+                record for record in result["records"]
+                if record.thread == ident
+            ]
+
+            if result["error"]:
+                state["ordersWithError"].add(Plugin.order)
+
+    # Each plug-in lowers the level of the global logger whilst
+    # processing, and restores it once finished. Lowering it up front
+    # prevents a concurrent plug-in from restoring it prematurely.
+    root = logging.getLogger()
+    level = root.level
+    root.setLevel(logging.DEBUG)
+
+    try:
+        pool.map(run, pipelines)
+
+    finally:
+        root.setLevel(level)
@@ -7,8 +7,10 @@ the integration between them.
 
 import os
 import sys
+import json
 import shutil
 import tempfile
+import contextlib
 
 from maya import cmds
 
@@ -17,6 +19,9 @@ import pyblish.util
 
 from avalon import api, maya, io, inventory, schema
 
+import polly
+from polly import profiling
+
 from nose.tools import (
     with_setup,
     assert_equals,
@@ -103,17 +108,20 @@ def clear():
 
 
 def publish():
-    context = pyblish.util.publish()
+    with profiling.Profiler() as profiler:
+        context = pyblish.util.publish()
 
-    header = "{:<10}{:<40} -> {}".format("Success", "Plug-in", "Instance")
-    result = "{success:<10}{plugin.__name__:<40} -> {instance}"
+    header = "{:<10}{:<10}{:<40} -> {}".format(
+        "Success", "Time", "Plug-in", "Instance")
+    result = ("{success:<10}{wallTime:<10.3f}"
+              "{plugin.__name__:<40} -> {instance}")
     error = "{:<10}+-- EXCEPTION: {:<70} line {:<20}"
     record = "{:<10}+-- {level}: {message:<70}"
 
     results = list()
-    for r in context.data["results"]:
+    for r, p in zip(context.data["results"], profiler.records):
         # Format summary
-        results.append(result.format(**r))
+        results.append(result.format(wallTime=p["wallTime"], **r))
 
         # Format log records
         for lr in r["records"]:
@@ -132,16 +140,102 @@ def publish():
 {header}
 {line}
 {results}
+
+{profile}
     """
 
     if not IS_SILENT:
         print(report.format(header=header,
                             results="\n".join(results),
+                            profile=profiler.summary(),
                             line="-" * 70))
 
     return context
 
 
+def _png():
+    """Return a valid, single-pixel PNG image"""
+    import zlib
+    import struct
+    from polly import lib
+
+    def chunk(type_, data):
+        crc = zlib.crc32(type_ + data) & 0xffffffff
+        return struct.pack(">I", len(data)) + type_ + data + struct.pack(
+            ">I", crc)
+
+    return (lib.PNG_MAGIC +
+            chunk(b"IHDR", struct.pack(">IIBBBBB", 1, 1, 8, 2, 0, 0, 0)) +
+            chunk(b"IDAT", zlib.compress(b"\x00" * 4)) +
+            chunk(b"IEND", b""))
+
+
+@contextlib.contextmanager
+def patched(obj, **attributes):
+    """Temporarily replace `attributes` of `obj`"""
+    originals = dict((key, getattr(obj, key)) for key in attributes)
+
+    for key, value in attributes.items():
+        setattr(obj, key, value)
+
+    try:
+        yield
+
+    finally:
+        for key, value in originals.items():
+            setattr(obj, key, value)
+
+
+class Database(object):
+    """In-memory stand-in for the queries made to avalon.io on publish"""
+
+    class Inserted(object):
+        def __init__(self, inserted_id):
+            self.inserted_id = inserted_id
+
+    def __init__(self, *documents):
+        self.documents = list(documents)
+
+    def find(self, filter, projection=None, sort=None):
+        documents = [
+            document for document in self.documents
+            if all(document.get(key) == value
+                   for key, value in filter.items())
+        ]
+
+        for key, direction in reversed(sort or []):
+            documents.sort(key=lambda document: document[key],
+                           reverse=direction < 0)
+
+        return documents
+
+    def find_one(self, filter, projection=None, sort=None):
+        documents = self.find(filter, projection, sort)
+        return documents[0] if documents else None
+
+    def insert_one(self, document):
+        document = dict(document, _id=len(self.documents) + 1)
+        self.documents.append(document)
+        return self.Inserted(document["_id"])
+
+    def update_many(self, filter, update):
+        for document in self.find(filter):
+            for key, value in update["$set"].items():
+                parent = document
+                path = key.split(".")
+
+                for name in path[:-1]:
+                    parent = parent.setdefault(name, {})
+
+                parent[path[-1]] = value
+
+    def patched(self):
+        return patched(io,
+                       find_one=self.find_one,
+                       insert_one=self.insert_one,
+                       update_many=self.update_many)
+
+
 @with_setup(clear)
 def test_modeling():
     """Modeling workflow is functional"""
@@ -190,6 +284,48 @@ def test_modeling():
     }) is not None
 
 
+@with_setup(clear)
+def test_background_export():
+    """Scenes exported by mayapy workers are integrated and cleaned up"""
+    transform, generator = cmds.polyCube(name="body_PLY")
+    group = cmds.group(transform, name="ROOT")
+
+    cmds.select(group, replace=True)
+    maya.create(
+        name="modelBackground",
+        asset=ASSET_NAME,
+        family="mindbender.model",
+        options={"useSelection": True}
+    )
+
+    cmds.file(save=True)
+
+    api.Session["AVALON_BACKGROUND_EXTRACTION"] = "1"
+
+    try:
+        context = publish()
+    finally:
+        api.Session.pop("AVALON_BACKGROUND_EXTRACTION")
+
+    jobs = context.data["workerJobs"]
+    assert jobs
+    assert all(job.succeeded() for job in jobs)
+
+    # The snapshot is removed once every export has finished
+    assert "workerScene" not in context.data
+
+    cmds.file(new=True, force=True)
+
+    representation = io.locate([
+        PROJECT_NAME, ASSET_NAME, "modelBackground", 1, "ma"
+    ])
+
+    container = maya.load(representation)
+    nodes = cmds.sets(container, query=True)
+    assembly = cmds.ls(nodes, assemblies=True)[0]
+    assert_equals(assembly, "Bruce_01_:modelBackground")
+
+
 @with_setup(clear)
 def test_alembic_export():
     """Exporting Alembic works"""
@@ -262,6 +398,28 @@ def test_alembic_export():
             "Cached visibility did not match original visibility")
 
 
+@with_setup(clear)
+def test_animation_without_instances():
+    """No background export is submitted without animation to extract"""
+    from polly.maya import worker
+
+    Plugin = next(Plugin for Plugin in pyblish.api.discover()
+                  if Plugin.__name__ == "ExtractMindbenderAnimation")
+
+    context = pyblish.api.Context()
+    instance = context.create_instance("animationDefault")
+    instance.data["family"] = "mindbender.animation"
+    instance.data["publish"] = False
+
+    def submit(*args, **kwargs):
+        raise AssertionError("Submitted %s" % (args,))
+
+    with patched(worker, enabled=lambda: True, submit=submit):
+        Plugin().process(context)
+
+    assert "workerJobs" not in context.data
+
+
 @with_setup(clear)
 def test_update():
     """Updating works"""
@@ -316,6 +474,146 @@ def test_update():
     maya.update(container, 3)
 
 
+@with_setup(clear)
+def test_single_assembly_shared_shaders():
+    """Shapes sharing shaders with the asset are not part of it"""
+    body, _ = cmds.polyCube(name="body_PLY")
+    other, _ = cmds.polyCube(name="other_PLY")
+    cmds.polyCube(name="unshaded_PLY")
+
+    # Shared with a shape outside of the asset
+    shader = cmds.shadingNode("blinn", asShader=True)
+    engine = cmds.sets(renderable=True,
+                       noSurfaceShader=True,
+                       empty=True,
+                       name=shader + "SG")
+    cmds.connectAttr(shader + ".outColor", engine + ".surfaceShader")
+    cmds.sets([body, other], forceElement=engine)
+
+    group = cmds.group(body, name="ROOT")
+    cmds.group(other, name="OTHER")
+
+    cmds.select(group, replace=True)
+    maya.create(
+        name="modelDefault",
+        asset=ASSET_NAME,
+        family="mindbender.model",
+        options={"useSelection": True}
+    )
+
+    context = pyblish.util.collect()
+    instance = next(instance for instance in context
+                    if instance.data["family"] == "mindbender.model")
+
+    Plugin = next(Plugin for Plugin in pyblish.api.discover()
+                  if Plugin.__name__ == "ValidateMindbenderSingleAssembly")
+    Plugin().process(instance)
+
+    assert_equals(Plugin.assemblies, ["ROOT"])
+
+
+@with_setup(clear)
+def test_rig_component_members():
+    """Components in out_SET are validated by their transform"""
+    body, _ = cmds.polyCube(name="body_PLY")
+    ctrl = cmds.circle(name="main_CTL")[0]
+    group = cmds.group([body, ctrl], name="ROOT")
+
+    out_set = cmds.sets(body + ".f[0:2]", name="out_SET")
+    controls_set = cmds.sets(ctrl, name="controls_SET")
+
+    cmds.select([group, out_set, controls_set], noExpand=True)
+    maya.create(
+        name="rigDefault",
+        asset=ASSET_NAME,
+        family="mindbender.rig",
+        options={"useSelection": True}
+    )
+
+    context = pyblish.util.collect()
+    instance = next(instance for instance in context
+                    if instance.data["family"] == "mindbender.rig")
+
+    Plugin = next(Plugin for Plugin in pyblish.api.discover()
+                  if Plugin.__name__ == "ValidateMindbenderRigFormat")
+
+    try:
+        Plugin().process(instance)
+    except AssertionError as e:
+        assert str(e).endswith("|ROOT|body_PLY"), e
+    else:
+        raise AssertionError("Mesh without ID was not reported")
+
+
+@with_setup(clear)
+def test_id_index_callbacks():
+    """Only nodes carrying an ID are watched, until uninstalled"""
+    from polly.maya import lib
+
+    cmds.createNode("transform", name="plain")
+    node = cmds.createNode("transform", name="identified")
+
+    lib.install_id_index()
+
+    try:
+        lib.assign_ids(["|identified"])
+        id_ = cmds.getAttr(node + ".mbID")
+
+        assert_equals(lib.ls_id(id_), ["|identified"])
+        assert_equals(len(lib._indexed), 1)
+
+        # Changes to the ID are tracked through its callback
+        cmds.setAttr(node + ".mbID", "changed", type="string")
+        assert_equals(lib.ls_id("changed"), ["|identified"])
+        assert_equals(lib.ls_id(id_), [])
+
+        cmds.delete(node)
+        assert_equals(lib.ls_id("changed"), [])
+        assert_equals(len(lib._indexed), 0)
+
+    finally:
+        lib.uninstall_id_index()
+
+    assert_equals(lib._index_callbacks, [])
+    assert_equals(len(lib._indexed), 0)
+
+
+@with_setup(clear)
+def test_locked_normals():
+    """Only meshes with locked normals are reported"""
+    clean, _ = cmds.polyCube(name="clean_PLY")
+    locked, _ = cmds.polyCube(name="locked_PLY")
+    cmds.polyNormalPerVertex(locked + ".vtx[0]", freezeNormal=True)
+
+    group = cmds.group([clean, locked], name="ROOT")
+
+    cmds.select(group, replace=True)
+    maya.create(
+        name="modelDefault",
+        asset=ASSET_NAME,
+        family="mindbender.model",
+        options={"useSelection": True}
+    )
+
+    context = pyblish.util.collect()
+    instance = next(instance for instance in context
+                    if instance.data["family"] == "mindbender.model")
+
+    Plugin = next(Plugin for Plugin in pyblish.api.discover()
+                  if Plugin.__name__ == "ValidateMindbenderNormals")
+
+    try:
+        Plugin().process(instance)
+    except AssertionError as e:
+        assert "locked_PLYShape" in str(e), e
+        assert "clean_PLYShape" not in str(e), e
+    else:
+        raise AssertionError("Locked normals were not reported")
+
+    cmds.polyNormalPerVertex(locked + ".vtx[*]", unFreezeNormal=True)
+    Plugin().process(instance)
+
+
 @with_setup(clear)
 def test_update_imported():
     """You cannot update an imported container"""
@@ -388,3 +686,317 @@ def test_modeling_to_rigging():
     nodes = cmds.sets(container, query=True)
     assembly = cmds.ls(nodes, assemblies=True)[0]
     assert_equals(assembly, "Bruce_01_:rigDefault")
+
+    # Each representation references its own scene
+    for ext in ("ma", "mb"):
+        cmds.file(new=True, force=True)
+
+        representation = io.locate([
+            PROJECT_NAME, ASSET_NAME, "rigDefault", 1, ext
+        ])
+
+        container = maya.load(representation)
+        nodes = cmds.sets(container, query=True)
+        reference = cmds.referenceQuery(nodes[0], filename=True)
+        assert reference.endswith("." + ext), reference
+
+
+def test_image_headers():
+    """Broken frames are detected from their headers"""
+    from polly import lib
+
+    png = _png()
+
+    frames = {
+        "valid.0001.png": png,
+        "truncated.0001.png": png[:-6],
+        "empty.0001.png": b"",
+    }
+
+    for fname, data in frames.items():
+        with open(os.path.join(self._tempdir, fname), "wb") as f:
+            f.write(data)
+
+    invalid = lib.check_images(
+        os.path.join(self._tempdir, fname) for fname in frames
+    )
+
+    assert_equals(
+        sorted(os.path.basename(path) for path, _ in invalid),
+        ["empty.0001.png", "truncated.0001.png"]
+    )
+
+
+@with_setup(clear)
+def test_progressive_publish():
+    """Progressive publishing waits on every frame of every render layer"""
+    from avalon.vendor import requests
+
+    workspace = os.path.join(self._tempdir, "renders", "shot")
+    states = {"layerA": 1, "layerB": 6}  # Active and Pending
+
+    os.makedirs(workspace)
+
+    def submit(layer):
+        with open(os.path.join(workspace, layer + ".json"), "w") as f:
+            json.dump({
+                "instance": {
+                    "startFrame": 1,
+                    "endFrame": 2,
+                    "byFrameStep": 1,
+                },
+                "jobs": [{"_id": layer}],
+            }, f)
+
+    for layer in states:
+        submit(layer)
+
+    def render(layer, frame):
+        dirname = os.path.join(workspace, layer)
+        if not os.path.isdir(dirname):
+            os.makedirs(dirname)
+
+        fname = os.path.join(dirname, "%s.%04d.png" % (layer, frame))
+        with open(fname, "wb") as f:
+            f.write(_png())
+
+    class Response(object):
+        ok = True
+
+        def __init__(self, url):
+            self.job = url.rsplit("=", 1)[-1]
+
+        def json(self):
+            return [{"Stat": states[self.job]}]
+
+    class Slept(Exception):
+        pass
+
+    def sleep(seconds):
+        raise Slept()
+
+    class CollectShot(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder - 0.5
+
+        def process(self, context):
+            context.data.update({
+                "workspaceDir": workspace,
+                "currentFile": os.path.join(workspace, "<shell>"),
+                "time": api.time(),
+                "user": "test",
+            })
+
+    pyblish.api.register_host("shell")
+
+    try:
+        plugins = [CollectShot] + [
+            Plugin for Plugin in pyblish.api.discover(
+                paths=[polly.PUBLISH_PATH])
+            if Plugin.__name__ in ("CollectMindbenderImageSequences",
+                                   "ValidateMindbenderDeadlineDone",
+                                   "IntegrateAvalonAsset")
+        ]
+
+    finally:
+        pyblish.api.deregister_host("shell")
+
+    database = Database(
+        {"_id": "project", "type": "project", "config": self._config},
+        {"_id": "asset", "type": "asset", "name": ASSET_NAME},
+    )
+
+    def versions():
+        return dict(
+            (subset["name"], database.find({"type": "version",
+                                            "parent": subset["_id"]}))
+            for subset in database.find({"type": "subset"})
+        )
+
+    def publish(sleep=sleep, **kwargs):
+        with database.patched(), \
+                patched(requests, get=Response), \
+                patched(polly.time, sleep=sleep):
+            return polly.publish_progressively(plugins=plugins, **kwargs)
+
+    api.Session["AVALON_DEADLINE"] = "http://deadline"
+
+    try:
+        # Layer B is yet to output a frame
+        render("layerA", 1)
+        render("layerA", 2)
+
+        try:
+            publish()
+        except Slept:
+            pass
+        else:
+            raise AssertionError("Published before layerB had rendered")
+
+        assert_equals(list(versions()), ["layerA"])
+        assert_equals(versions()["layerA"][0]["data"]["complete"], False)
+
+        # Deadline finished both jobs after collection
+        # of the final frame of layer B.
+        render("layerB", 1)
+        states.update({"layerA": 3, "layerB": 3})
+
+        try:
+            publish()
+        except Slept:
+            pass
+        else:
+            raise AssertionError("Published before layerB was collected")
+
+        assert_equals(versions()["layerA"][0]["data"]["complete"], True)
+        assert_equals(versions()["layerB"][0]["data"]["complete"], False)
+
+        render("layerB", 2)
+        publish()
+
+        assert_equals(len(versions()["layerA"]), 1)
+        assert_equals(len(versions()["layerB"]), 1)
+        assert_equals(versions()["layerB"][0]["data"]["complete"], True)
+
+        # An incomplete version of an abandoned render is left as-is
+        database.documents += [
+            {"_id": "layerC", "type": "subset",
+             "parent": "asset", "name": "layerC"},
+            {"_id": "abandoned", "type": "version", "parent": "layerC",
+             "name": 1, "data": {"complete": False, "jobs": ["old"]}},
+        ]
+
+        # The second frame is dropped, and reported once retries run out
+        submit("layerC")
+        render("layerC", 1)
+        states["layerC"] = 3
+
+        try:
+            publish(sleep=lambda seconds: None, retries=2)
+        except RuntimeError as e:
+            assert str(e).endswith("layerC.%04d.png [1]: 2"), e
+        else:
+            raise AssertionError("Published with a frame missing")
+
+        assert_equals(
+            sorted((version["name"], version["data"]["complete"])
+                   for version in versions()["layerC"]),
+            [(1, False), (2, False)])
+
+    finally:
+        api.Session.pop("AVALON_DEADLINE")
+
+
+def test_scheduler():
+    """Concurrent publishing finishes each stage before the next"""
+    import time
+    import random
+    import threading
+    from polly import scheduler
+
+    events = list()
+    lock = threading.Lock()
+
+    def record(stage, instance):
+        time.sleep(random.random() * 0.1)
+
+        with lock:
+            events.append((stage, instance.name))
+
+    class Collect(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder
+
+        def process(self, context):
+            for name in ("A", "B", "C", "D"):
+                instance = context.create_instance(name)
+                instance.data["family"] = "test"
+
+    class Validate(pyblish.api.InstancePlugin):
+        order = pyblish.api.ValidatorOrder
+        concurrent = True
+
+        def process(self, instance):
+            record("validate", instance)
+            assert instance.name not in instance.context.data["invalid"]
+
+    class Extract(pyblish.api.InstancePlugin):
+        order = pyblish.api.ExtractorOrder
+        concurrent = True
+
+        def process(self, instance):
+            record("extract", instance)
+
+    class Integrate(pyblish.api.InstancePlugin):
+        order = pyblish.api.IntegratorOrder
+
+        def process(self, instance):
+            record("integrate", instance)
+
+    plugins = [Collect, Validate, Extract, Integrate]
+    stages = ["validate", "extract", "integrate"]
+
+    context = pyblish.api.Context()
+    context.data["invalid"] = []
+    scheduler.publish(context, plugins, workers=4)
+
+    assert_equals(len(events), 12)
+    assert_equals([stage for stage, _ in events],
+                  sorted((stage for stage, _ in events), key=stages.index))
+
+    # A failed validation stops the publish ahead of integration
+    del events[:]
+
+    context = pyblish.api.Context()
+    context.data["invalid"] = ["B"]
+    scheduler.publish(context, plugins, workers=4)
+
+    assert_equals(sorted(events), [("validate", name)
+                                   for name in ("A", "B", "C", "D")])
+
+
+def test_profiler():
+    """Profiles total the cost of each plug-in and instance"""
+
+    class ValidateA(pyblish.api.InstancePlugin):
+        pass
+
+    class ValidateB(pyblish.api.InstancePlugin):
+        pass
+
+    processed = [
+        # Plug-in, instance, duration (ms), peak memory
+        (ValidateA, "a", 250, 1000),
+        (ValidateA, "b", 500, 1000),
+        (ValidateB, "a", 125, 1500),
+        (ValidateB, None, 125, 1800),
+    ]
+
+    memory = iter([1000] + [peak for _, _, _, peak in processed])
+
+    with patched(profiling, _peak_memory=lambda: next(memory)):
+        with profiling.Profiler() as profiler:
+            for Plugin, instance, duration, _ in processed:
+                pyblish.api.emit("pluginProcessed", result={
+                    "plugin": Plugin,
+                    "instance": instance,
+                    "success": True,
+                    "duration": duration,
+                })
+
+    report = profiler.report()
+
+    assert_equals([record["memoryIncrease"] for record in report["records"]],
+                  [0, 0, 500, 300])
+    assert_equals(report["peakMemory"], 1800)
+    assert_equals(report["memoryIncrease"], 800)
+    assert_equals(report["wallTime"], 1.0)
+
+    assert_equals(report["plugins"]["ValidateA"]["wallTime"], 0.75)
+    assert_equals(report["plugins"]["ValidateB"]["memoryIncrease"], 800)
+    assert_equals(sorted(report["instances"]), ["a", "b"])
+    assert_equals(report["instances"]["a"]["memoryIncrease"], 500)
+
+    # Most expensive first
+    lines = profiler.summary().splitlines()
+    assert lines[2].startswith("ValidateA"), lines
+    assert lines[3].startswith("ValidateB"), lines
+    assert lines[3].endswith("+800"), lines
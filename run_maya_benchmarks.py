@@ -0,0 +1,44 @@
+"""Use Mayapy for benchmarking
+
+Usage:
+    $ mayapy run_maya_benchmarks.py
+
+"""
+
+import time
+import contextlib
+
+
+@contextlib.contextmanager
+def timer(label):
+    start = time.time()
+    yield
+    print("%-40s %.3fs" % (label, time.time() - start))
+
+
+def benchmark_ids(count=100000):
+    """Assign IDs to `count` nodes"""
+    from maya import cmds
+    from polly import lib as polly_lib
+    from polly.maya import lib
+
+    cmds.file(new=True, force=True)
+
+    with timer("Allocate %d IDs" % count):
+        polly_lib.allocate_ids(count)
+
+    nodes = [cmds.createNode("transform", skipSelect=True)
+             for _ in range(count)]
+    nodes = cmds.ls(nodes, long=True)
+
+    with timer("Assign %d IDs" % count):
+        lib.assign_ids(nodes)
+
+    assert len(lib.id_index()) == count, "IDs collided"
+
+
+if __name__ == "__main__":
+    from maya import standalone
+    standalone.initialize()
+
+    benchmark_ids()